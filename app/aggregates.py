@@ -0,0 +1,227 @@
+"""Агрегаційний шар дашборду.
+
+Усі зведені таблиці, які будують сторінки `streamlit_app.py`, рахуються тут
+один раз на версію датасету. Версія — це хеш вмісту файлу даних, тож кеш
+автоматично інвалідується, коли оновлюється `cleaned_data.csv`.
+
+Таблиці будуються з сум і лічильників по групах (`group_sums`). Суми можна
+додавати між собою, тому той самий код працює і для цілого датасету, і для
+потокового читання частинами (див. `streaming.py`).
+"""
+import glob
+import hashlib
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from countries import country_table
+
+
+# --- ВЕРСІЯ ДАТАСЕТУ ---
+# Шлях → (mtime_ns, розмір, хеш). Один запис на файл: змінений файл
+# перезаписує свій запис, тож словник росте лише з кількістю файлів,
+# а не з кількістю їхніх версій (фіксований LRU тут не годиться —
+# версія датасету щоразу обходить усі частини й суми в тому самому порядку)
+_DIGESTS = {}
+
+
+def _file_digest(path, mtime_ns, size):
+    cached = _DIGESTS.get(path)
+    if cached is not None and cached[:2] == (mtime_ns, size):
+        return cached[2]
+    # Хешуємо файл блоками, щоб не тримати його цілком у пам'яті
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    _DIGESTS[path] = (mtime_ns, size, digest.hexdigest()[:16])
+    return _DIGESTS[path][2]
+
+
+def dataset_version(*paths):
+    """Повертає короткий хеш вмісту одного або кількох файлів.
+
+    Повторне хешування відбувається лише тоді, коли змінився час модифікації
+    або розмір файлу, тож на кожному перезапуску скрипта це майже безкоштовно.
+    """
+    digests = []
+    for path in paths:
+        stat = os.stat(path)
+        digests.append(_file_digest(os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+    if len(digests) == 1:
+        return digests[0]
+    return hashlib.sha256(''.join(digests).encode()).hexdigest()[:16]
+
+
+# --- СУМИ ТА ЛІЧИЛЬНИКИ ПО ГРУПАХ ---
+# назва: (колонки групування, колонки для середніх)
+GROUP_SPECS = {
+    'platform': (['Most_Used_Platform'], ['Addicted_Score']),
+    'type': (['Platform_Type'], ['Addicted_Score', 'Avg_Daily_Usage_Hours']),
+    'type_gender': (['Platform_Type', 'Gender'], []),
+    'type_platform': (['Platform_Type', 'Most_Used_Platform'], ['Addicted_Score']),
+    'relationship': (['Relationship_Status'], ['Conflicts_Over_Social_Media']),
+    'country': (['Country'], ['Addicted_Score']),
+    'region': (['Region'], ['Addicted_Score']),
+    'region_platform': (['Region', 'Most_Used_Platform'], []),
+}
+
+
+def group_sums(df):
+    """Суми, кількості непорожніх значень та розміри груп для кожної специфікації."""
+    sums = {}
+    for name, (keys, values) in GROUP_SPECS.items():
+        grouped = df.groupby(keys, observed=True)
+        table = grouped.size().to_frame('n')
+        if values:
+            table = table.join(grouped[values].sum().add_suffix('_sum'))
+            table = table.join(grouped[values].count().add_suffix('_count'))
+        # Звичайний (не категоріальний) індекс, щоб суми з різних частин
+        # датасету коректно вирівнювались при додаванні
+        table = table.reset_index()
+        table[keys] = table[keys].astype(object)
+        sums[name] = table.set_index(keys).astype('float64')
+    return sums
+
+
+def merge_sums(left, right):
+    """Додає дві колекції сум (наприклад, від двох частин одного файлу)."""
+    if left is None:
+        return right
+    merged = {}
+    for name, (keys, _) in GROUP_SPECS.items():
+        merged[name] = pd.concat([left[name], right[name]]).groupby(level=keys).sum()
+    return merged
+
+
+def _means(table, values):
+    result = pd.DataFrame(index=table.index)
+    for col in values:
+        result[col] = table[f'{col}_sum'] / table[f'{col}_count']
+    return result
+
+
+# --- ПОБУДОВА АГРЕГАТІВ ---
+def aggregates_from_sums(sums):
+    """Зведені таблиці для сторінок дашборду з накопичених сум."""
+    aggs = {}
+
+    # Аналіз гіпотез: платформи (Гіпотеза 3)
+    aggs['platform_stats'] = (
+        _means(sums['platform'], ['Addicted_Score'])
+        .sort_values('Addicted_Score', ascending=False).reset_index()
+    )
+
+    # Типи контенту
+    type_stats = _means(sums['type'], ['Addicted_Score', 'Avg_Daily_Usage_Hours'])
+    type_stats['Student_ID'] = sums['type']['n'].astype('int64')
+    aggs['type_stats'] = type_stats.reset_index()
+
+    aggs['gender_data'] = sums['type_gender']['n'].astype('int64').reset_index(name='Count')
+
+    tree_data = _means(sums['type_platform'], ['Addicted_Score'])
+    tree_data['Student_ID'] = sums['type_platform']['n'].astype('int64')
+    aggs['tree_data'] = tree_data.reset_index()
+
+    # Соціальні зв'язки (Гіпотеза 4)
+    aggs['conflict_stats'] = (
+        _means(sums['relationship'], ['Conflicts_Over_Social_Media'])
+        .sort_values('Conflicts_Over_Social_Media').reset_index()
+    )
+
+    # Географія
+    # ISO-3 з таблиці країн: карта не зіставляє назви на кожному рендері
+    country_map_data = _means(sums['country'], ['Addicted_Score']).reset_index()
+    country_map_data['ISO3'] = country_map_data['Country'].map(country_table(country_map_data['Country'])['ISO3'])
+    aggs['country_map_data'] = country_map_data
+    aggs['region_stats'] = (
+        _means(sums['region'], ['Addicted_Score'])
+        .sort_values('Addicted_Score', ascending=True).reset_index()
+    )
+
+    # Регіон × платформа: одна група для карти лідерів і матриці концентрації
+    region_counts = sums['region_platform']['n'].astype('int64').reset_index(name='Count')
+    aggs['region_counts'] = region_counts
+    aggs['top_reg'] = region_counts.loc[region_counts.groupby('Region')['Count'].idxmax()]
+    aggs['bubble_data'] = region_counts.rename(columns={'Count': 'User_Count'})
+
+    return aggs
+
+
+def build_aggregates(df):
+    """Рахує всі зведені таблиці для сторінок дашборду за один прохід."""
+    return aggregates_from_sums(group_sums(df))
+
+
+# --- ЗБЕРЕЖЕННЯ СУМ ---
+SUMS_DIR = 'data/processed/aggregates'
+
+
+# Кожна таблиця сум пам'ятає у метаданих Parquet, які дописані частини
+# (див. incremental.py) у неї вже додано: оновлення після збою можна
+# повторити, не рахуючи ті самі рядки двічі.
+PARTS_KEY = b'dashboard.parts'
+
+
+def _write_table(table, path, parts):
+    arrow = pa.Table.from_pandas(table.reset_index(), preserve_index=False)
+    arrow = arrow.replace_schema_metadata({**(arrow.schema.metadata or {}), PARTS_KEY: json.dumps(sorted(parts)).encode()})
+    tmp_path = f'{path}.tmp'
+    pq.write_table(arrow, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def save_sums(sums, directory=SUMS_DIR, parts=()):
+    """Зберігає суми; `parts` — назви дописаних частин, що вже в них враховані."""
+    os.makedirs(directory, exist_ok=True)
+    for name, table in sums.items():
+        _write_table(table, os.path.join(directory, f'{name}.parquet'), parts)
+
+
+def _read_table(path, keys):
+    arrow = pq.read_table(path)
+    metadata = arrow.schema.metadata or {}
+    parts = set(json.loads(metadata[PARTS_KEY])) if PARTS_KEY in metadata else None
+    table = arrow.to_pandas()
+    table[keys] = table[keys].astype(object)
+    return table.set_index(keys), parts
+
+
+def fold_parts(part_paths, directory=SUMS_DIR):
+    """Додає до збережених сум суми частин `part_paths`, яких у них ще немає.
+
+    Кожна таблиця оновлюється атомарно і окремо, тож після збою посередині
+    повторний виклик додає частину лише до тих таблиць, де її ще немає.
+    Таблиці без списку частин (записані до його появи) вважаються такими,
+    що вже містять усі `part_paths`, — тоді лише записується список.
+    """
+    batches = {}
+    for name, (keys, _) in GROUP_SPECS.items():
+        path = os.path.join(directory, f'{name}.parquet')
+        table, parts = _read_table(path, keys)
+        names = [os.path.basename(part) for part in part_paths]
+        if parts is None:
+            _write_table(table, path, names)
+            continue
+        missing = [part for part, part_name in zip(part_paths, names) if part_name not in parts]
+        if not missing:
+            continue
+        for part in missing:
+            if part not in batches:
+                batches[part] = group_sums(pd.read_parquet(part))
+            table = pd.concat([table, batches[part][name]]).groupby(level=keys).sum()
+        _write_table(table, path, parts | {os.path.basename(part) for part in missing})
+
+
+def sums_files(directory=SUMS_DIR):
+    return sorted(glob.glob(os.path.join(directory, '*.parquet')))
+
+
+def load_sums(directory=SUMS_DIR):
+    return {
+        name: _read_table(os.path.join(directory, f'{name}.parquet'), keys)[0]
+        for name, (keys, _) in GROUP_SPECS.items()
+    }
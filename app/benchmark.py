@@ -0,0 +1,382 @@
+"""Бенчмарк шляхів даних і рендерингу дашборду (без браузера).
+
+Синтетичні датасети зі схемою `cleaned_data` отримуються перевибіркою
+рядків реального датасету (зі збереженням спільних розподілів) з новими
+`Student_ID`. Для кожної сторінки окремо вимірюються етапи: завантаження,
+агрегація, побудова фігур і серіалізація в JSON — час, пікова пам'ять
+та розмір того, що піде в браузер. `peak_mb` (tracemalloc) охоплює
+Python і numpy, але не буфери Arrow, тому поруч пишеться `max_rss_mb` —
+максимум резидентної пам'яті процесу на кінець етапу. Сторінки без
+фільтрів вимірюються так, як їх показує дашборд (зі збережених сум і
+результатів тестів), а сторінки з фільтрами — окремим випадком
+«(фільтри)» з розрахунком по рядках. Результати зберігаються у JSON, щоб
+порівнювати їх між комітами:
+
+    python app/benchmark.py --sizes 1k 100k 1m 10m
+    python app/benchmark.py --startup
+    python app/benchmark.py --compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from aggregates import aggregates_from_sums, build_aggregates, group_sums, load_sums, merge_sums, save_sums
+from charts import MAX_POINTS, box_stats, ols_lines, resolve_mode, stratified_sample
+from figures import (
+    academic_box, concentration_bubbles, conflicts_bar, country_choropleth, gender_bar,
+    mental_health_box, platform_bar, platform_treemap, region_bar, relationship_box,
+    sleep_scatter, type_scatter
+)
+from hypotheses import SAMPLE_ROWS, TEST_COLUMNS, VIEW_RESAMPLES, evaluate
+from hypotheses import load_results as load_tests, save_results as save_tests
+from maps import leaders_map_html
+from model import CLUSTER_FEATURES, MODEL_PATH, load_model, score
+from storage import AGGREGATE_COLUMNS, PAGE_COLUMNS, PARQUET_PATH, read_dataset, sample_dataset
+from summary import load_summary, preview_frame, save_summary, summarize_parquet, summary_metrics
+
+
+SIZES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+DATA_DIR = 'benchmarks/data'
+RESULTS_DIR = 'benchmarks/results'
+CHUNK_ROWS = 1_000_000
+# Стільки ж перевибірок, скільки дашборд рахує на вимогу для вибірок з
+# фільтрами (повні результати рахує інжест, див. hypotheses.py)
+BENCH_RESAMPLES = VIEW_RESAMPLES
+# Версія, під якою зберігаються артефакти інжесту синтетичних датасетів
+ARTIFACT_VERSION = 'benchmark'
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streamlit_app.py')
+STARTUP_REPEATS = 5
+
+
+# --- СИНТЕТИЧНІ ДАНІ ---
+def synthetic_dataset(n_rows, path, seed_path=PARQUET_PATH, seed=42):
+    """Parquet з `n_rows` рядків, перевибраних з реального датасету."""
+    seed_df = read_dataset(seed_path)
+    rng = np.random.default_rng(seed)
+    tmp_path = f'{path}.tmp'
+    writer = None
+    try:
+        for start in range(0, n_rows, CHUNK_ROWS):
+            size = min(CHUNK_ROWS, n_rows - start)
+            chunk = seed_df.iloc[rng.integers(0, len(seed_df), size)].reset_index(drop=True)
+            chunk['Student_ID'] = np.arange(start + 1, start + size + 1, dtype='int64')
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema, compression='zstd')
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, path)
+    return path
+
+
+def dataset_path(label, data_dir=DATA_DIR):
+    """Шлях до синтетичного датасету; генерується лише один раз."""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f'synthetic-{label}.parquet')
+    if not os.path.exists(path):
+        synthetic_dataset(SIZES[label], path)
+    return path
+
+
+# --- ВИМІРЮВАННЯ ---
+def measure(stages, name, fn, payload=None):
+    """Виконує `fn`, записує час і пікову пам'ять етапу; повертає результат."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stages.append({
+        'stage': name,
+        'seconds': elapsed,
+        'peak_mb': peak / 2**20,
+        # ru_maxrss у Linux — у кілобайтах
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10,
+        'payload_bytes': payload(result) if payload else None,
+    })
+    return result
+
+
+def _figures_json(figures):
+    return [pio.to_json(fig, validate=False) for fig in figures]
+
+
+def _total_length(parts):
+    return sum(len(part.encode('utf-8')) if isinstance(part, str) else len(part) for part in parts)
+
+
+# --- СТОРІНКИ ---
+# Кожна функція повторює роботу відповідної гілки streamlit_app.py без кешів
+def bench_home(path, append_dir, stages, **_):
+    # Знімок пише інжест; його побудова вимірюється окремо від показу сторінки
+    snapshot_path = f'{path}.summary.json'
+    measure(stages, 'snapshot', lambda: save_summary(summarize_parquet(path), 'benchmark', snapshot_path))
+    summary = measure(stages, 'load', lambda: load_summary(snapshot_path))
+    measure(stages, 'aggregate', lambda: summary_metrics(summary))
+    preview = measure(stages, 'preview', lambda: preview_frame(summary))
+    # st.dataframe передає таблицю у форматі Arrow IPC
+    measure(stages, 'serialize', lambda: [pa.ipc.serialize_pandas(preview).to_pybytes()], _total_length)
+
+
+def ingest_artifacts(path, append_dir):
+    """Суми по групах і результати тестів, які для датасету пише інжест.
+
+    Генеруються лише один раз (як при потоковому інжесті: суми — пакетами,
+    тести — на вибірці `SAMPLE_ROWS` рядків) і не входять у заміри сторінок.
+    """
+    sums_dir, tests_path = f'{path}.sums', f'{path}.hypotheses.json'
+    if not os.path.exists(tests_path):
+        sums = None
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=CHUNK_ROWS, columns=AGGREGATE_COLUMNS):
+            sums = merge_sums(sums, group_sums(batch.to_pandas()))
+        save_sums(sums, sums_dir)
+        sample = sample_dataset(path, TEST_COLUMNS, SAMPLE_ROWS, append_dir, batch_size=CHUNK_ROWS)
+        save_tests(evaluate(sample), ARTIFACT_VERSION, tests_path)
+    return sums_dir, tests_path
+
+
+def _prepare_points(df):
+    mode = resolve_mode('auto', len(df))
+    prepared = {
+        'trendlines': ols_lines(df, 'Avg_Daily_Usage_Hours', 'Sleep_Hours_Per_Night', 'Addiction_Level'),
+        'points': stratified_sample(df, 'Addiction_Level', MAX_POINTS) if mode == 'sample' else df,
+    }
+    if mode != 'exact':
+        prepared['mental'] = box_stats(df, 'Addiction_Level', 'Mental_Health_Score')
+        prepared['relationship'] = box_stats(df, 'Relationship_Status', 'Addicted_Score')
+        prepared['academic'] = box_stats(df, 'Addiction_Level', 'Affects_Academic_Performance_Numeric')
+    return mode, prepared
+
+
+def _hypotheses_figures(df, mode, aggs, prepared):
+    exact = mode == 'exact'
+    return [
+        sleep_scatter(prepared['points'], prepared['trendlines']),
+        mental_health_box(df) if exact else mental_health_box(stats=prepared['mental']),
+        platform_bar(aggs['platform_stats']),
+        type_scatter(aggs['type_stats']),
+        gender_bar(aggs['gender_data']),
+        platform_treemap(aggs['tree_data']),
+        conflicts_bar(aggs['conflict_stats']),
+        relationship_box(df) if exact else relationship_box(stats=prepared['relationship']),
+        academic_box(df) if exact else academic_box(stats=prepared['academic']),
+    ]
+
+
+def bench_hypotheses(path, append_dir, stages, **_):
+    # Без фільтрів: агрегати — зі збережених сум, тести — збережені інжестом
+    sums_dir, tests_path = ingest_artifacts(path, append_dir)
+    df = measure(stages, 'load', lambda: read_dataset(path, PAGE_COLUMNS['Аналіз гіпотез'], append_dir))
+
+    def aggregate():
+        return aggregates_from_sums(load_sums(sums_dir)), *_prepare_points(df)
+
+    aggs, mode, prepared = measure(stages, 'aggregate', aggregate)
+    measure(stages, 'tests', lambda: load_tests(ARTIFACT_VERSION, tests_path))
+    figures = measure(stages, 'figures', lambda: _hypotheses_figures(df, mode, aggs, prepared))
+    measure(stages, 'serialize', lambda: _figures_json(figures), _total_length)
+
+
+def bench_hypotheses_filtered(path, append_dir, stages, resamples=BENCH_RESAMPLES, **_):
+    # З фільтрами все рахується по рядках; фільтр пропускає всі рядки (найгірший випадок)
+    columns = sorted(set(PAGE_COLUMNS['Аналіз гіпотез']) | set(AGGREGATE_COLUMNS) | set(TEST_COLUMNS))
+    df = measure(stages, 'load', lambda: read_dataset(path, columns, append_dir))
+
+    def aggregate():
+        return build_aggregates(df), *_prepare_points(df)
+
+    aggs, mode, prepared = measure(stages, 'aggregate', aggregate)
+    # Сторінка одразу показує ефект і p-value; інтервали — на вимогу
+    measure(stages, 'tests', lambda: evaluate(df, n_resamples=0, numbers=range(1, 7)))
+    measure(stages, 'tests_ci', lambda: evaluate(df, n_resamples=resamples, numbers=range(1, 7)))
+    figures = measure(stages, 'figures', lambda: _hypotheses_figures(df, mode, aggs, prepared))
+    measure(stages, 'serialize', lambda: _figures_json(figures), _total_length)
+
+
+def _geography_stages(stages, aggs):
+    figures = measure(stages, 'figures', lambda: [
+        country_choropleth(aggs['country_map_data']),
+        region_bar(aggs['region_stats']),
+        concentration_bubbles(aggs['bubble_data']),
+    ])
+    leaders_map = measure(stages, 'map', lambda: leaders_map_html(aggs['top_reg']))
+    measure(stages, 'serialize', lambda: _figures_json(figures) + [leaders_map], _total_length)
+
+
+def bench_geography(path, append_dir, stages, **_):
+    # Без фільтрів сторінка не читає рядків: лише суми й збережені тести
+    sums_dir, tests_path = ingest_artifacts(path, append_dir)
+    sums = measure(stages, 'load', lambda: load_sums(sums_dir))
+    aggs = measure(stages, 'aggregate', lambda: aggregates_from_sums(sums))
+    measure(stages, 'tests', lambda: load_tests(ARTIFACT_VERSION, tests_path))
+    _geography_stages(stages, aggs)
+
+
+def bench_geography_filtered(path, append_dir, stages, **_):
+    columns = sorted(set(AGGREGATE_COLUMNS) | set(TEST_COLUMNS))
+    df = measure(stages, 'load', lambda: read_dataset(path, columns, append_dir))
+    aggs = measure(stages, 'aggregate', lambda: build_aggregates(df))
+    measure(stages, 'tests', lambda: evaluate(df, n_resamples=0, numbers=(7,)))
+    _geography_stages(stages, aggs)
+
+
+def bench_ml(path, append_dir, stages, **_):
+    model = measure(stages, 'load', lambda: load_model(MODEL_PATH))
+    features = read_dataset(path, CLUSTER_FEATURES, append_dir)
+    measure(stages, 'score_one', lambda: score(model, features.iloc[0].to_dict()))
+    # Пакетне оцінювання анкет — той самий векторизований шлях
+    measure(stages, 'score_batch', lambda: score(model, features))
+
+
+PAGES = {
+    'Головна': bench_home,
+    'Аналіз гіпотез': bench_hypotheses,
+    'Глобальна географія': bench_geography,
+    'ML Діагностика': bench_ml,
+}
+# Ті самі сторінки з активними фільтрами (у результатах — з позначкою FILTERED_SUFFIX)
+FILTERED_PAGES = {
+    'Аналіз гіпотез': bench_hypotheses_filtered,
+    'Глобальна географія': bench_geography_filtered,
+}
+FILTERED_SUFFIX = ' (фільтри)'
+
+
+def _cases(pages):
+    for page in pages or PAGES:
+        yield page, PAGES[page]
+        if page in FILTERED_PAGES:
+            yield page + FILTERED_SUFFIX, FILTERED_PAGES[page]
+
+
+def run(labels, pages=None, data_dir=DATA_DIR, resamples=BENCH_RESAMPLES):
+    rows = []
+    # Неіснуюча тека: синтетичний датасет без дописаних частин
+    append_dir = os.path.join(data_dir, 'no-appended-parts')
+    # Прогрів (імпорти й шаблони Plotly) на найменшому датасеті, без запису
+    for _, bench in _cases(pages):
+        bench(dataset_path('1k', data_dir), append_dir, [], resamples=resamples)
+    for label in labels:
+        path = dataset_path(label, data_dir)
+        for page, bench in _cases(pages):
+            stages = []
+            bench(path, append_dir, stages, resamples=resamples)
+            rows += [{'size': label, 'rows': SIZES[label], 'page': page, **stage} for stage in stages]
+    return pd.DataFrame(rows)
+
+
+# --- ХОЛОДНИЙ СТАРТ ---
+# Окремий інтерпретатор на кожен замір: імпорти й кеші Streamlit порожні.
+# Streamlit імпортується до початку заміру — його вартість від застосунку не залежить.
+STARTUP_SCRIPT = '''
+import sys, time
+from streamlit.testing.v1 import AppTest
+started = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=600)
+at.run()
+if at.sidebar.radio[0].value != sys.argv[2]:
+    at.sidebar.radio[0].set_value(sys.argv[2]).run()
+assert not at.exception, at.exception
+print(time.perf_counter() - started)
+'''
+
+
+def startup_times(pages=None, repeats=STARTUP_REPEATS, app_path=APP_PATH):
+    """Медіанний час від запуску скрипта до першого показу кожної сторінки."""
+    rows = []
+    for page in pages or PAGES:
+        seconds = []
+        for _ in range(repeats):
+            output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT, app_path, page],
+                                    capture_output=True, text=True, check=True).stdout
+            seconds.append(float(output.split()[-1]))
+        rows.append({'size': 'startup', 'rows': None, 'page': page, 'stage': 'cold_start',
+                     'seconds': float(np.median(seconds)), 'peak_mb': None, 'max_rss_mb': None,
+                     'payload_bytes': None})
+    return pd.DataFrame(rows)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def save_results(results, resamples, results_dir=RESULTS_DIR):
+    os.makedirs(results_dir, exist_ok=True)
+    now = datetime.now(timezone.utc)
+    commit = _git_commit()
+    meta = {
+        'commit': commit,
+        'timestamp': now.isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'resamples': resamples,
+    }
+    path = os.path.join(results_dir, f"{now:%Y%m%d-%H%M%S}-{commit}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'results': results.to_dict(orient='records')}, f, ensure_ascii=False, indent=1)
+    return path
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return pd.DataFrame(json.load(f)['results'])
+
+
+def compare(old_path, new_path):
+    """Відношення часу та пам'яті нового запуску до старого для кожного етапу."""
+    keys = ['size', 'page', 'stage']
+    old, new = load_results(old_path), load_results(new_path)
+    merged = old.merge(new, on=keys, suffixes=('_old', '_new'))
+    merged['time_ratio'] = merged['seconds_new'] / merged['seconds_old']
+    merged['memory_ratio'] = merged['peak_mb_new'] / merged['peak_mb_old']
+    return merged[keys + ['seconds_old', 'seconds_new', 'time_ratio', 'memory_ratio']]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Бенчмарк сторінок дашборду на синтетичних даних.')
+    parser.add_argument('--sizes', nargs='+', default=list(SIZES), choices=list(SIZES), help='розміри датасетів')
+    parser.add_argument('--pages', nargs='+', choices=list(PAGES), help='лише ці сторінки')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='де зберігати синтетичні датасети')
+    parser.add_argument('--results-dir', default=RESULTS_DIR, help='куди записати результати')
+    parser.add_argument('--resamples', type=int, default=BENCH_RESAMPLES, help='бутстреп-перевибірок у тестах')
+    parser.add_argument('--startup', action='store_true', help='виміряти холодний старт застосунку')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='порівняти два файли результатів')
+    args = parser.parse_args(argv)
+
+    with pd.option_context('display.width', 200, 'display.max_rows', None):
+        if args.compare:
+            print(compare(*args.compare).round(3).to_string(index=False))
+            return
+
+        if args.startup:
+            results = startup_times(args.pages)
+        else:
+            results = run(args.sizes, args.pages, args.data_dir, args.resamples)
+        print(results.round(4).to_string(index=False))
+    print(f"Результати збережено у '{save_results(results, args.resamples, args.results_dir)}'")
+
+
+if __name__ == '__main__':
+    main()
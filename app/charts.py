@@ -0,0 +1,101 @@
+"""Підготовка даних для графіків з великою кількістю точок.
+
+Scatter і box-графіки в Plotly серіалізують кожен рядок у JSON для браузера.
+Для великих датасетів замість сирих точок передаються вибірка зі
+збереженням пропорцій груп, 2D-гістограма або попередньо пораховані
+квартилі. Лінія OLS рахується один раз на повних даних.
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+
+# Скільки точок на графік відправляти в браузер
+MAX_POINTS = 5000
+DENSITY_BINS = 40
+
+# auto — усі точки для малих датасетів, агрегати для великих
+RENDER_MODES = {
+    'auto': 'Авто',
+    'exact': 'Усі точки',
+    'sample': 'Вибірка',
+    'density': 'Щільність',
+}
+
+
+def resolve_mode(mode, n_rows, max_points=MAX_POINTS):
+    if mode == 'auto':
+        return 'exact' if n_rows <= max_points else 'sample'
+    return mode
+
+
+def stratified_sample(df, by, n=MAX_POINTS, seed=42):
+    """Випадкова вибірка ~`n` рядків з однаковою часткою в кожній групі `by`."""
+    if len(df) <= n:
+        return df
+    return df.groupby(by, observed=True).sample(frac=n / len(df), random_state=seed)
+
+
+def ols_lines(df, x, y, by):
+    """Кінці лінії OLS для кожної групи `by` (на повних даних)."""
+    rows = []
+    for group, part in df.groupby(by, observed=True):
+        if part[x].nunique() < 2:
+            continue
+        slope, intercept = np.polyfit(part[x].to_numpy('float64'), part[y].to_numpy('float64'), 1)
+        x_range = np.array([part[x].min(), part[x].max()], dtype='float64')
+        rows.append({by: group, 'x': x_range, 'y': slope * x_range + intercept})
+    return rows
+
+
+def box_stats(df, x, y):
+    """Квартилі та межі «вусів» (1.5 IQR, як у Plotly) для кожної групи `x`."""
+    grouped = df.groupby(x, observed=True)[y]
+    stats = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ['q1', 'median', 'q3']
+    iqr = stats['q3'] - stats['q1']
+    low = df[x].map(stats['q1'] - 1.5 * iqr).astype('float64')
+    high = df[x].map(stats['q3'] + 1.5 * iqr).astype('float64')
+    inside = df[y].where((df[y] >= low) & (df[y] <= high))
+    stats['lowerfence'] = inside.groupby(df[x], observed=True).min()
+    stats['upperfence'] = inside.groupby(df[x], observed=True).max()
+    stats['mean'] = grouped.mean()
+    return stats
+
+
+def density_figure(df, x, y, bins=DENSITY_BINS, labels=None):
+    """2D-гістограма, порахована на сервері: у браузер іде лише сітка."""
+    counts, x_edges, y_edges = np.histogram2d(df[x], df[y], bins=bins)
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=np.where(counts.T > 0, counts.T, np.nan),
+        colorscale='Blues', colorbar={'title': 'Кількість'}, name='',
+    ))
+    if labels:
+        fig.update_layout(xaxis_title=labels[0], yaxis_title=labels[1])
+    return fig
+
+
+def add_trendlines(fig, lines, by, colors):
+    for line in lines:
+        group = line[by]
+        fig.add_trace(go.Scatter(
+            x=line['x'], y=line['y'], mode='lines', name=f'{group} (OLS)',
+            line={'color': colors.get(group)}, legendgroup=str(group), showlegend=False,
+        ))
+    return fig
+
+
+def box_figure(stats, colors=None, labels=None):
+    """Box-графік з попередньо порахованих квартилів (без сирих точок)."""
+    colors = colors or {}
+    fig = go.Figure()
+    for group, row in stats.iterrows():
+        fig.add_trace(go.Box(
+            x=[group], name=str(group), q1=[row['q1']], median=[row['median']], q3=[row['q3']],
+            lowerfence=[row['lowerfence']], upperfence=[row['upperfence']], mean=[row['mean']],
+            marker_color=colors.get(group),
+        ))
+    if labels:
+        fig.update_layout(xaxis_title=labels[0], yaxis_title=labels[1])
+    return fig
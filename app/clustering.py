@@ -0,0 +1,192 @@
+"""Кластеризація датасетів, що не вміщаються в пам'ять.
+
+Дані читаються з Parquet частинами (лише колонки ознак). Перший прохід
+навчає `StandardScaler`, другий — `MiniBatchKMeans` через `partial_fit`,
+тож у пам'яті одночасно є лише одна частина. Результат має той самий
+формат, що й `model.fit_model`, і зберігається тим самим `save_model`.
+
+Перебір кількості кластерів (inertia та silhouette на вибірці) виконується
+паралельно, для кожного k окремо виводяться час і пікова пам'ять навчання
+та обчислення метрик (пам'ять silhouette обмежена `METRIC_WORKING_MEMORY`).
+Збережена модель з обраним k одразу переписує колонку `Cluster` датасету,
+дописаних частин і копії у CSV (`relabel`), а наступні перезбірки
+(`pipeline.py`) беруть k зі збереженої моделі:
+
+    python app/clustering.py --sweep 2 8
+    python app/clustering.py --k 4
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from joblib import Parallel, delayed
+from sklearn import config_context
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+from aggregates import dataset_version, sums_files
+from hypotheses import load_results, save_results
+from model import CLUSTER_FEATURES, MODEL_PATH, N_CLUSTERS, make_artifact, save_model
+from storage import APPEND_DIR, CSV_PATH, PARQUET_PATH, dataset_files, read_preview, write_lock
+from summary import PREVIEW_ROWS, build_summary, load_summary, save_summary
+
+
+DEFAULT_BATCH_SIZE = 100_000
+SAMPLE_SIZE = 10_000
+# Робоча пам'ять (МБ) для попарних відстаней silhouette; без обмеження
+# scikit-learn бере до 1 ГБ на блок, і з --jobs -1 це множиться на ядра
+METRIC_WORKING_MEMORY = 64
+
+
+def iter_feature_batches(path=PARQUET_PATH, batch_size=DEFAULT_BATCH_SIZE, append_dir=APPEND_DIR):
+    """Ознаки частинами по `batch_size` рядків з усіх частин датасету."""
+    for file in dataset_files(path, append_dir):
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=batch_size, columns=CLUSTER_FEATURES):
+            yield batch.to_pandas()[CLUSTER_FEATURES].astype('float64')
+
+
+def fit_scaler(path=PARQUET_PATH, batch_size=DEFAULT_BATCH_SIZE, append_dir=APPEND_DIR):
+    scaler = StandardScaler()
+    for x in iter_feature_batches(path, batch_size, append_dir):
+        scaler.partial_fit(x)
+    return scaler
+
+
+def fit_minibatch(path=PARQUET_PATH, n_clusters=N_CLUSTERS, batch_size=DEFAULT_BATCH_SIZE, scaler=None,
+                  append_dir=APPEND_DIR):
+    """Навчає MiniBatchKMeans за два проходи по файлу."""
+    scaler = scaler or fit_scaler(path, batch_size, append_dir)
+    kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=42, n_init=3)
+    for x in iter_feature_batches(path, batch_size, append_dir):
+        # partial_fit потребує щонайменше n_clusters рядків у частині
+        if len(x) >= n_clusters:
+            kmeans.partial_fit(scaler.transform(x))
+    return make_artifact(scaler, kmeans)
+
+
+def relabel(model, path=PARQUET_PATH, append_dir=APPEND_DIR, csv_path=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Переписує колонку `Cluster` датасету й дописаних частин кластерами від `model`.
+
+    Без цього `incremental.py` і пакетна діагностика призначали б кластери
+    моделлю, відмінною від тієї, що розмітила збережені рядки. Файли
+    переписуються частинами й атомарно (див. `streaming.label_clusters`);
+    `csv_path` — копія основного файлу у CSV, яку теж треба оновити.
+    """
+    from streaming import label_clusters
+
+    for i, file in enumerate(dataset_files(path, append_dir)):
+        label_clusters(file, file, model, csv_path if i == 0 else None, batch_size)
+
+
+def restamp(old_version, new_version, path=PARQUET_PATH):
+    """Переносить знімок «Головної» і результати тестів на версію після `relabel`.
+
+    Суми й тести від кластерів не залежать, тож змінюється лише версія
+    (і попередній перегляд рядків у знімку). Застарілі файли не чіпаються.
+    """
+    summary = load_summary()
+    if summary is not None and summary.pop('version') == old_version:
+        summary['preview'] = build_summary(read_preview(path, PREVIEW_ROWS))['preview']
+        save_summary(summary, new_version)
+    results = load_results(old_version)
+    if results is not None:
+        save_results(results, new_version)
+
+
+def sample_features(path=PARQUET_PATH, size=SAMPLE_SIZE, batch_size=DEFAULT_BATCH_SIZE, seed=42):
+    """Рівномірна випадкова вибірка приблизно `size` рядків за один прохід."""
+    total = sum(pq.ParquetFile(file).metadata.num_rows for file in dataset_files(path))
+    fraction = min(1.0, size / total)
+    rng = np.random.default_rng(seed)
+    parts = [x[rng.random(len(x)) < fraction] for x in iter_feature_batches(path, batch_size)]
+    return pd.concat(parts, ignore_index=True)
+
+
+def evaluate_k(path, n_clusters, sample, scaler, batch_size=DEFAULT_BATCH_SIZE):
+    """Навчання для одного k: якість на вибірці, час і пікова пам'ять.
+
+    Навчання частинами та метрики на вибірці вимірюються окремо: пам'ять
+    першого залежить від `batch_size`, другого — від розміру вибірки.
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+    model = fit_minibatch(path, n_clusters, batch_size, scaler=scaler)
+    fit_seconds = time.perf_counter() - started
+    _, fit_peak = tracemalloc.get_traced_memory()
+
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    x_scaled = scaler.transform(sample)
+    labels = model['kmeans'].predict(x_scaled)
+    inertia = -model['kmeans'].score(x_scaled)
+    with config_context(working_memory=METRIC_WORKING_MEMORY):
+        silhouette = silhouette_score(x_scaled, labels) if len(set(labels)) > 1 else np.nan
+    metric_seconds = time.perf_counter() - started
+    _, metric_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'k': n_clusters,
+        'inertia': inertia,
+        'silhouette': silhouette,
+        'fit_seconds': fit_seconds,
+        'fit_peak_mb': fit_peak / 2**20,
+        'metric_seconds': metric_seconds,
+        'metric_peak_mb': metric_peak / 2**20,
+    }
+
+
+def sweep(path=PARQUET_PATH, ks=range(2, 9), sample_size=SAMPLE_SIZE,
+          batch_size=DEFAULT_BATCH_SIZE, n_jobs=-1):
+    """Перебір кількості кластерів паралельно на всіх ядрах.
+
+    Scaler і вибірка рахуються один раз і спільні для всіх k.
+    """
+    scaler = fit_scaler(path, batch_size)
+    sample = sample_features(path, sample_size, batch_size)
+    rows = Parallel(n_jobs=n_jobs)(
+        delayed(evaluate_k)(path, k, sample, scaler, batch_size) for k in ks
+    )
+    return pd.DataFrame(rows).set_index('k')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Кластеризація частинами та вибір кількості кластерів.')
+    parser.add_argument('--data', default=PARQUET_PATH, help='оброблений датасет (Parquet)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='рядків у частині')
+    parser.add_argument('--sweep', nargs=2, type=int, metavar=('K_MIN', 'K_MAX'),
+                        help='перебрати k від K_MIN до K_MAX включно')
+    parser.add_argument('--sample-size', type=int, default=SAMPLE_SIZE, help='розмір вибірки для метрик')
+    parser.add_argument('--jobs', type=int, default=-1, help='кількість процесів (-1 — усі ядра)')
+    parser.add_argument('--k', type=int, default=N_CLUSTERS, help='кількість кластерів для навчання')
+    parser.add_argument('--model', default=MODEL_PATH, help='куди записати модель')
+    parser.add_argument('--csv', default=CSV_PATH, help="копія датасету у CSV для оновлення ('' — не оновлювати)")
+    args = parser.parse_args(argv)
+
+    if args.sweep:
+        k_min, k_max = args.sweep
+        report = sweep(args.data, range(k_min, k_max + 1), args.sample_size, args.batch_size, args.jobs)
+        print(report.round(3).to_string())
+        return
+
+    def current_version():
+        return dataset_version(*dataset_files(args.data), *sums_files())
+
+    # Модель, кластери й збережені результати змінюються разом, тож
+    # дашборд не зніме реліз посередині (див. refresh.py)
+    with write_lock(args.data):
+        old_version = current_version()
+        model = fit_minibatch(args.data, args.k, args.batch_size)
+        save_model(model, args.model)
+        relabel(model, args.data, csv_path=args.csv if args.csv and os.path.exists(args.csv) else None,
+                batch_size=args.batch_size)
+        restamp(old_version, current_version(), args.data)
+    print(f"Модель з {args.k} кластерами збережено у '{args.model}', кластери датасету оновлено")
+
+
+if __name__ == '__main__':
+    main()
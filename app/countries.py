@@ -0,0 +1,96 @@
+"""Таблиця відповідності країна → ISO-3, ISO-2, континент.
+
+Таблиця генерується один раз через `pycountry_convert` (з ручними
+виправленнями) і постачається разом із застосунком, тож ні інжест, ні
+карта не зіставляють назви країн на льоту:
+
+    python app/countries.py
+"""
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+
+# Версія формату та ручних виправлень; змінюється разом з назвою файлу
+COUNTRY_TABLE_VERSION = 2
+COUNTRY_TABLE_PATH = f'data/reference/countries_v{COUNTRY_TABLE_VERSION}.csv'
+
+# Назви, які pycountry_convert не розпізнає сам
+MANUAL_COUNTRY_CODES = {
+    'USA': 'US', 'UK': 'GB', 'South Korea': 'KR', 'UAE': 'AE',
+    'Russia': 'RU', 'Vietnam': 'VN', 'Czech Republic': 'CZ',
+    'Trinidad': 'TT', 'Kosovo': 'XK', 'Bosnia': 'BA',
+    'Bahamas': 'BS', 'Hong Kong': 'HK', 'Taiwan': 'TW',
+    'Vatican City': 'VA'
+}
+# Коди, яких немає в ISO 3166 (Косово — загальновживаний XK/XKX); без
+# власного коду Косово збігалося б із Сербією й перекривало її на карті
+MANUAL_ALPHA3 = {'XK': 'XKX'}
+# Пряме виправлення континенту (Ватикан pycountry_convert не відносить до Європи)
+MANUAL_CONTINENTS = {'Vatican City': 'Europe', 'Kosovo': 'Europe'}
+CONTINENT_NAMES = {
+    'AF': 'Africa', 'AS': 'Asia', 'EU': 'Europe',
+    'NA': 'North America', 'SA': 'South America', 'OC': 'Oceania'
+}
+
+
+def resolve_country(country_name):
+    """ISO-2, ISO-3 та континент для однієї назви (None, 'Other', якщо не знайдено)."""
+    from pycountry_convert import (
+        country_alpha2_to_continent_code, country_name_to_country_alpha2,
+        map_country_alpha2_to_country_alpha3
+    )
+
+    try:
+        iso2 = MANUAL_COUNTRY_CODES.get(country_name) or country_name_to_country_alpha2(country_name)
+    except Exception:
+        return None, None, MANUAL_CONTINENTS.get(country_name, 'Other')
+    iso3 = MANUAL_ALPHA3.get(iso2) or map_country_alpha2_to_country_alpha3().get(iso2)
+    if country_name in MANUAL_CONTINENTS:
+        return iso2, iso3, MANUAL_CONTINENTS[country_name]
+    try:
+        continent = CONTINENT_NAMES.get(country_alpha2_to_continent_code(iso2), 'Other')
+    except Exception:
+        continent = 'Other'
+    return iso2, iso3, continent
+
+
+def build_country_table(countries):
+    rows = [(name, *resolve_country(name)) for name in sorted(set(countries))]
+    return pd.DataFrame(rows, columns=['Country', 'ISO2', 'ISO3', 'Region'])
+
+
+def write_country_table(table, path=COUNTRY_TABLE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    table.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+@lru_cache(maxsize=4)
+def load_country_table(path=COUNTRY_TABLE_PATH):
+    """Таблиця, індексована назвою країни (читається один раз на процес)."""
+    # keep_default_na=False: код Намібії 'NA' не повинен стати NaN
+    table = pd.read_csv(path, keep_default_na=False, na_values=[''])
+    return table.set_index('Country')
+
+
+def country_table(countries, path=COUNTRY_TABLE_PATH):
+    """Рядки таблиці для `countries`; відсутні в ній назви визначаються на льоту."""
+    table = load_country_table(path) if os.path.exists(path) else None
+    known = table.index if table is not None else pd.Index([])
+    missing = pd.Index(pd.unique(pd.Series(countries, dtype=object))).difference(known)
+    if len(missing):
+        extra = build_country_table(missing).set_index('Country')
+        table = extra if table is None else pd.concat([table, extra])
+    return table
+
+
+if __name__ == '__main__':
+    from pipeline import RAW_PATH
+
+    raw = pd.read_csv(RAW_PATH, usecols=['Country'])
+    table = build_country_table(raw['Country'])
+    write_country_table(table)
+    print(f"Таблицю з {len(table)} країн збережено у '{COUNTRY_TABLE_PATH}'")
@@ -0,0 +1,45 @@
+"""Обмежений LRU-кеш готових фігур Plotly.
+
+Ключ — версія датасету, назва графіка та параметри, від яких він залежить.
+Незмінені графіки повторно використовуються між перезапусками скрипта
+і між сесіями, а найдавніше використані витісняються, коли кеш заповнено.
+"""
+import threading
+from collections import OrderedDict
+
+
+FIGURE_CACHE_SIZE = 64
+
+
+class FigureCache:
+    def __init__(self, max_size=FIGURE_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """Повертає фігуру з кешу або будує її через `build()` і запам'ятовує."""
+        with self._lock:
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return self._figures[key]
+            self.misses += 1
+
+        # Будуємо поза блокуванням, щоб інші сесії не чекали
+        figure = build()
+        with self._lock:
+            self._figures[key] = figure
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_size:
+                self._figures.popitem(last=False)
+        return figure
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+
+    def __len__(self):
+        return len(self._figures)
@@ -0,0 +1,241 @@
+"""Фігури Plotly для сторінок дашборду.
+
+Кожна функція отримує вже підготовлені дані (агрегати, вибірку або
+квартилі) і лише будує фігуру, тож її можна кешувати (див.
+`figure_cache.py`) і вимірювати окремо від завантаження даних.
+"""
+import plotly.express as px
+
+from charts import add_trendlines, box_figure, density_figure
+
+
+LEVEL_ORDER = {"Addiction_Level": ["Low", "Medium", "High"]}
+LEVEL_COLORS = {"Low": "green", "Medium": "orange", "High": "red"}
+
+
+# --- АНАЛІЗ ГІПОТЕЗ ---
+def sleep_scatter(points, trendlines, density=False):
+    """Гіпотеза 1: точки (або 2D-гістограма) та лінії OLS, пораховані заздалегідь."""
+    scatter_labels = {"Avg_Daily_Usage_Hours": "Годин у мережі",
+                      "Sleep_Hours_Per_Night": "Годин сну",
+                      "Addiction_Level": "Рівень залежності"}
+    if density:
+        fig1 = density_figure(
+            points, "Avg_Daily_Usage_Hours", "Sleep_Hours_Per_Night",
+            labels=(scatter_labels["Avg_Daily_Usage_Hours"], scatter_labels["Sleep_Hours_Per_Night"])
+        )
+    else:
+        fig1 = px.scatter(
+            points, x="Avg_Daily_Usage_Hours", y="Sleep_Hours_Per_Night",
+            color="Addiction_Level",
+            labels=scatter_labels,
+            color_discrete_map=LEVEL_COLORS,
+            category_orders=LEVEL_ORDER
+        )
+    # OLS на повних даних, на графіку — лише лінія
+    return add_trendlines(fig1, trendlines, "Addiction_Level", LEVEL_COLORS)
+
+
+def mental_health_box(df=None, stats=None):
+    """Гіпотеза 2: усі точки з `df` або попередньо пораховані квартилі `stats`."""
+    if stats is not None:
+        return box_figure(stats, colors=LEVEL_COLORS, labels=("Рівень залежності", "Бал ментального здоров'я"))
+    return px.box(
+        df, x="Addiction_Level", y="Mental_Health_Score",
+        color="Addiction_Level", points="all",
+        labels={"Addiction_Level": "Рівень залежності", "Mental_Health_Score": "Бал ментального здоров'я"},
+        color_discrete_map=LEVEL_COLORS,
+        category_orders=LEVEL_ORDER
+    )
+
+
+def platform_bar(platform_stats):
+    return px.bar(
+        platform_stats, x="Most_Used_Platform", y="Addicted_Score",
+        color="Addicted_Score",
+        labels={"Most_Used_Platform": "Основна платформа", "Addicted_Score": "Середній бал залежності"},
+        color_continuous_scale="Reds"
+    )
+
+
+def type_scatter(type_stats):
+    fig_scatter = px.scatter(
+        type_stats,
+        x="Avg_Daily_Usage_Hours",
+        y="Addicted_Score",
+        size="Student_ID",
+        color="Platform_Type",
+        text="Platform_Type", # Підписи прямо на графіку
+        labels={"Avg_Daily_Usage_Hours": "Сер. час використання (год)",
+                "Addicted_Score": "Сер. бал залежності"},
+        title="Де виникає найшвидша залежність?",
+        height=500
+    )
+
+    # НАЛАШТУВАННЯ ВІЗУАЛУ
+    fig_scatter.update_layout(
+        showlegend=False,
+        margin=dict(l=20, r=20, t=60, b=20) # Відступи для кращого вигляду
+    )
+
+    # Налаштування осей: фіксований крок 1.0 та вільний простір
+    fig_scatter.update_xaxes(dtick=1.0, range=[2, 7])
+    fig_scatter.update_yaxes(dtick=1.0, range=[3, 8])
+
+    # Корекція тексту: щоб не налізав на бульбашки та не обрізався
+    fig_scatter.update_traces(
+        textposition='top center',
+        cliponaxis=False
+    )
+    return fig_scatter
+
+
+def gender_bar(gender_data):
+    return px.bar(
+        gender_data,
+        x="Platform_Type",
+        y="Count",
+        color="Gender",
+        barmode="group",
+        labels={"Platform_Type": "Тип платформи",
+                "Count": "Кількість"},
+        title="Розподіл інтересів між чоловіками та жінками",
+        color_discrete_map={"Male": "#1f77b4", "Female": "#e377c2"}
+    )
+
+
+def platform_treemap(tree_data):
+    return px.treemap(
+        tree_data,
+        path=['Platform_Type', 'Most_Used_Platform'], # Створюємо ієрархію
+        values='Student_ID',
+        color='Addicted_Score',
+        color_continuous_scale='RdYlGn_r', # Від зеленого (низька) до червоного (висока)
+        labels={'Student_ID': 'Кількість користувачів', 'Addicted_Score': 'Сер. бал залежності'},
+        title="Популярність платформ у межах категорій (колір — рівень залежності)"
+    )
+
+
+def conflicts_bar(conflict_stats):
+    return px.bar(
+        conflict_stats,
+        x="Conflicts_Over_Social_Media",
+        y="Relationship_Status",
+        orientation='h',
+        title="Середня частота конфліктів за статусом стосунків",
+        labels={"Relationship_Status": "Статус стосунків", "Conflicts_Over_Social_Media": "Сер. кількість конфліктів"},
+        color="Conflicts_Over_Social_Media",
+        color_continuous_scale="Reds"
+    )
+
+
+def relationship_box(df=None, stats=None):
+    """Гіпотеза 5: усі точки з `df` або попередньо пораховані квартилі `stats`."""
+    title = "Розподіл рівня залежності за статусом стосунків"
+    if stats is not None:
+        fig6 = box_figure(
+            stats,
+            colors=dict(zip(stats.index, px.colors.qualitative.Safe)),
+            labels=("Статус стосунків", "Бал залежності")
+        )
+        return fig6.update_layout(title=title)
+    return px.box(
+        df,
+        x="Relationship_Status",
+        y="Addicted_Score",
+        color="Relationship_Status",
+        title=title,
+        labels={"Relationship_Status": "Статус стосунків", "Addicted_Score": "Бал залежності"},
+        color_discrete_sequence=px.colors.qualitative.Safe
+    )
+
+
+def academic_box(df=None, stats=None):
+    """Гіпотеза 6: усі точки з `df` або попередньо пораховані квартилі `stats`."""
+    if stats is not None:
+        return box_figure(stats, colors=LEVEL_COLORS,
+                          labels=("Рівень залежності", "Вплив на успішність (числовий бал)"))
+    return px.box(
+        df, x="Addiction_Level", y="Affects_Academic_Performance_Numeric",
+        color="Addiction_Level",
+        labels={
+            "Addiction_Level": "Рівень залежності",
+            "Affects_Academic_Performance_Numeric": "Вплив на успішність (числовий бал)"
+        },
+        color_discrete_map=LEVEL_COLORS,
+        category_orders=LEVEL_ORDER
+    )
+
+
+# --- ГЛОБАЛЬНА ГЕОГРАФІЯ ---
+def country_choropleth(country_map_data):
+    fig_map = px.choropleth(
+        country_map_data,
+        locations="ISO3",
+        locationmode="ISO-3",
+        color="Addicted_Score",
+        hover_name="Country",
+        color_continuous_scale="YlOrRd",
+        labels={"Addicted_Score": "Сер. бал залежності"}
+    )
+
+    fig_map.update_layout(
+        geo=dict(
+            showframe=False,
+            showcoastlines=True,
+            projection_type='natural earth' # Робимо карту візуально привабливішою
+        ),
+        margin={"r":0,"t":40,"l":0,"b":0}
+    )
+    return fig_map
+
+
+def region_bar(region_stats):
+    return px.bar(
+        region_stats,
+        x="Addicted_Score",
+        y="Region",
+        orientation='h',
+        color="Addicted_Score",
+        text_auto='.2f', # Виводимо точне значення на стовпчиках
+        title="Порівняння середнього рівня залежності за континентами",
+        labels={"Region": "Континент", "Addicted_Score": "Середній бал"},
+        color_continuous_scale="Viridis"
+    )
+
+
+def concentration_bubbles(bubble_data):
+    """Категоріальний bubble chart: регіон × платформа."""
+    # Сортування категорій: відсортовані списки назв
+    sorted_platforms = sorted(bubble_data['Most_Used_Platform'].unique())
+    sorted_regions = sorted(bubble_data['Region'].unique())
+
+    fig_bubble = px.scatter(
+        bubble_data,
+        x="Region",
+        y="Most_Used_Platform",
+        size="User_Count",          # Розмір залежить від кількості
+        color="User_Count",         # Колір для додаткового акценту
+        text="User_Count",          # Виводимо число всередині або поруч
+        size_max=60,                # Максимальний розмір бульбашки
+        labels={
+            "Region": "Регіон світу",
+            "Most_Used_Platform": "Соціальна мережа",
+            "User_Count": "Кількість"
+        },
+        # ПРИМУСОВЕ СОРТУВАННЯ ТУТ:
+        category_orders={
+            "Most_Used_Platform": sorted_platforms,
+            "Region": sorted_regions
+        },
+        color_continuous_scale="Viridis",
+        height=600
+    )
+
+    # Налаштування вигляду
+    fig_bubble.update_traces(textposition='middle center', textfont=dict(color='white'))
+    fig_bubble.update_layout(
+        xaxis={'side': 'top'}, # Переносимо назви регіонів вгору для зручності
+        showlegend=False
+    )
+    return fig_bubble
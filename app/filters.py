@@ -0,0 +1,56 @@
+"""Бітмап-індекс для перехресних фільтрів дашборду.
+
+Для кожного значення кожної колонки фільтра зберігається упакований бітсет
+(`np.packbits`) рядків, що мають це значення. Індекс будується один раз на
+версію датасету; комбінація фільтрів перетворюється на номери рядків
+через побітові OR (у межах колонки) та AND (між колонками).
+"""
+import numpy as np
+import pandas as pd
+
+
+# Колонки з вибором значень у бічній панелі
+FILTER_COLUMNS = [
+    'Region', 'Country', 'Most_Used_Platform', 'Platform_Type', 'Gender', 'Academic_Level'
+]
+# Колонки, що фільтруються діапазоном (значень мало, тож теж індексуються)
+RANGE_COLUMNS = ['Age']
+INDEX_COLUMNS = FILTER_COLUMNS + RANGE_COLUMNS
+
+
+class BitmapIndex:
+    def __init__(self, df, columns=INDEX_COLUMNS):
+        self.n_rows = len(df)
+        self.bitmaps = {}
+        for col in columns:
+            codes, values = pd.factorize(df[col], sort=True)
+            self.bitmaps[col] = {
+                value: np.packbits(codes == i) for i, value in enumerate(np.asarray(values).tolist())
+            }
+
+    def values(self, col):
+        return list(self.bitmaps[col])
+
+    def _column_bits(self, col, selected):
+        if col in RANGE_COLUMNS:
+            low, high = selected
+            selected = [value for value in self.bitmaps[col] if low <= value <= high]
+        bits = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for value in selected:
+            if value in self.bitmaps[col]:
+                bits |= self.bitmaps[col][value]
+        return bits
+
+    def positions(self, filters):
+        """Номери рядків, що задовольняють усі фільтри.
+
+        `filters` — пари (колонка, вибрані значення) або (колонка, (мін, макс))
+        для колонок з `RANGE_COLUMNS`.
+        """
+        if not filters:
+            return np.arange(self.n_rows)
+        bits = None
+        for col, selected in filters:
+            column_bits = self._column_bits(col, selected)
+            bits = column_bits if bits is None else bits & column_bits
+        return np.flatnonzero(np.unpackbits(bits, count=self.n_rows))
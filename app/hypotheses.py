@@ -0,0 +1,263 @@
+"""Статистична перевірка гіпотез з `PROJECT_PLAN.md`.
+
+Для кожної гіпотези рахується тест (кореляція або порівняння груп),
+p-value та бутстреп-інтервал довіри для розміру ефекту. Бутстреп
+векторизований: одна матриця індексів на пакет перевибірок, а пакети
+розподіляються між процесами.
+
+Результати для всього датасету рахуються під час інжесту (`pipeline.py`)
+і зберігаються поруч із даними; реліз (`refresh.py`) переносить їх, поки
+вони відповідають даним, а дашборд лише читає їх. Потоковий інжест рахує
+їх на рівномірній вибірці `SAMPLE_ROWS` рядків, щоб пам'ять не залежала
+від розміру файлу. На запит рахуються тільки вибірки з фільтрами (або
+дані, дописані після інжесту) і лише для гіпотез сторінки: спершу ефект
+і p-value без бутстрепу, а інтервали довіри (`VIEW_RESAMPLES`
+перевибірок) — на вимогу. Перевірка всього датасету без дашборду:
+
+    python app/hypotheses.py --resamples 5000
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy import stats
+
+from storage import PARQUET_PATH, read_dataset
+
+
+N_RESAMPLES = 2000
+# Перевибірок для вибірок з фільтрами, що рахуються під час запиту
+VIEW_RESAMPLES = 300
+HYPOTHESES_PATH = 'data/processed/hypotheses.json'
+# Розмір вибірки, на якій рахуються тести, коли датасет не читається
+# цілком (потоковий інжест, див. `storage.sample_dataset`)
+SAMPLE_ROWS = 200_000
+ALPHA = 0.05
+# Скільки елементів може мати одна матриця перевибірок (обмежує пам'ять)
+MAX_CELLS = 5_000_000
+# Менші задачі рахуються в поточному процесі: запуск пулу дорожчий
+PARALLEL_MIN_CELLS = 20_000_000
+
+# Колонки, потрібні для всіх гіпотез
+TEST_COLUMNS = [
+    'Avg_Daily_Usage_Hours', 'Sleep_Hours_Per_Night', 'Mental_Health_Score',
+    'Addicted_Score', 'Addiction_Level', 'Most_Used_Platform', 'Relationship_Status',
+    'Conflicts_Over_Social_Media', 'Affects_Academic_Performance_Numeric', 'Region'
+]
+FEED_PLATFORMS = ['TikTok', 'Instagram']
+
+
+# --- ВЕКТОРИЗОВАНІ СТАТИСТИКИ ДЛЯ БУТСТРЕПУ ---
+# Кожна функція отримує генератор і кількість перевибірок, повертає масив статистик
+def _pearson(rng, size, x, y):
+    idx = rng.integers(0, len(x), (size, len(x)))
+    xs, ys = x[idx], y[idx]
+    xs = xs - xs.mean(axis=1, keepdims=True)
+    ys = ys - ys.mean(axis=1, keepdims=True)
+    return (xs * ys).sum(axis=1) / np.sqrt((xs ** 2).sum(axis=1) * (ys ** 2).sum(axis=1))
+
+
+def _mean_diff(rng, size, a, b):
+    a_means = a[rng.integers(0, len(a), (size, len(a)))].mean(axis=1)
+    b_means = b[rng.integers(0, len(b), (size, len(b)))].mean(axis=1)
+    return a_means - b_means
+
+
+def _mean(rng, size, a):
+    return a[rng.integers(0, len(a), (size, len(a)))].mean(axis=1)
+
+
+def _bootstrap_chunk(statistic, arrays, n_resamples, seed):
+    rng = np.random.default_rng(seed)
+    batch = max(1, MAX_CELLS // max(len(a) for a in arrays))
+    parts = []
+    for start in range(0, n_resamples, batch):
+        parts.append(statistic(rng, min(batch, n_resamples - start), *arrays))
+    return np.concatenate(parts)
+
+
+def bootstrap_ci(statistic, arrays, n_resamples=N_RESAMPLES, alpha=ALPHA, seed=42, n_jobs=-1):
+    """Перцентильний інтервал довіри для `statistic` на перевибірках `arrays`.
+
+    Перевибірки діляться на частини з незалежними генераторами, тож
+    результат не залежить від кількості процесів. `n_resamples=0` —
+    без бутстрепу: інтервал (NaN, NaN).
+    """
+    if not n_resamples:
+        return np.nan, np.nan
+    n_chunks = 8
+    sizes = [len(part) for part in np.array_split(np.arange(n_resamples), n_chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    cells = n_resamples * sum(len(a) for a in arrays)
+    jobs = n_jobs if cells >= PARALLEL_MIN_CELLS else 1
+    chunks = Parallel(n_jobs=jobs)(
+        delayed(_bootstrap_chunk)(statistic, arrays, size, s) for size, s in zip(sizes, seeds) if size
+    )
+    values = np.concatenate(chunks)
+    return tuple(np.nanquantile(values, [alpha / 2, 1 - alpha / 2]))
+
+
+# --- ГІПОТЕЗИ ---
+def _result(number, title, test, effect_name, effect, p_value, ci, confirmed, n):
+    return {
+        'hypothesis': number, 'title': title, 'test': test,
+        'effect_name': effect_name, 'effect': effect, 'p_value': p_value,
+        'ci_low': ci[0], 'ci_high': ci[1], 'confirmed': bool(confirmed), 'n': n,
+    }
+
+
+def _bounds(ci, effect):
+    # Межі для вердикту; без бутстрепу напрям перевіряється за самим ефектом
+    return (effect, effect) if np.isnan(ci[0]) else ci
+
+
+def _no_data(number, title, test, effect_name):
+    return _result(number, title, test, effect_name, np.nan, np.nan, (np.nan, np.nan), False, 0)
+
+
+def _compare_groups(number, title, a, b, alternative, alpha, **bootstrap):
+    """Різниця середніх a − b: тест Манна — Вітні та бутстреп-інтервал."""
+    test, effect_name = 'Mann–Whitney U', 'Різниця середніх'
+    a, b = np.asarray(a, dtype='float64'), np.asarray(b, dtype='float64')
+    if len(a) < 2 or len(b) < 2:
+        return _no_data(number, title, test, effect_name)
+    p_value = stats.mannwhitneyu(a, b, alternative=alternative).pvalue
+    ci = bootstrap_ci(_mean_diff, (a, b), alpha=alpha, **bootstrap)
+    effect = a.mean() - b.mean()
+    # Інтервал повністю з потрібного боку від нуля
+    low, high = _bounds(ci, effect)
+    direction_ok = low > 0 if alternative == 'greater' else high < 0
+    return _result(number, title, test, effect_name, effect, p_value, ci,
+                   p_value < alpha and direction_ok, len(a) + len(b))
+
+
+def sleep_vs_usage(df, alpha=ALPHA, **bootstrap):
+    title = 'Час у соцмережах негативно корелює з тривалістю сну'
+    test, effect_name = 'Pearson r', 'r'
+    x = df['Avg_Daily_Usage_Hours'].to_numpy('float64')
+    y = df['Sleep_Hours_Per_Night'].to_numpy('float64')
+    if len(x) < 3:
+        return _no_data(1, title, test, effect_name)
+    r, p_value = stats.pearsonr(x, y)
+    ci = bootstrap_ci(_pearson, (x, y), alpha=alpha, **bootstrap)
+    return _result(1, title, test, effect_name, r, p_value, ci, p_value < alpha and _bounds(ci, r)[1] < 0, len(x))
+
+
+def mental_health_by_level(df, alpha=ALPHA, **bootstrap):
+    title = 'Вища залежність — нижчий бал ментального здоров\'я'
+    groups = df.groupby('Addiction_Level', observed=True)['Mental_Health_Score']
+    high = groups.get_group('High') if 'High' in groups.groups else []
+    low = groups.get_group('Low') if 'Low' in groups.groups else []
+    result = _compare_groups(2, title, high, low, 'less', alpha, **bootstrap)
+    # Загальна відмінність між усіма рівнями
+    samples = [group.to_numpy('float64') for _, group in groups if len(group) > 1]
+    if len(samples) > 1 and result['n']:
+        result['test'] = 'Kruskal–Wallis; High − Low'
+        result['p_value'] = stats.kruskal(*samples).pvalue
+        high = _bounds((result['ci_low'], result['ci_high']), result['effect'])[1]
+        result['confirmed'] = bool(result['p_value'] < alpha and high < 0)
+    return result
+
+
+def feed_platforms(df, alpha=ALPHA, **bootstrap):
+    title = 'Платформи з алгоритмічною стрічкою мають вищу залежність'
+    is_feed = df['Most_Used_Platform'].isin(FEED_PLATFORMS)
+    return _compare_groups(3, title, df.loc[is_feed, 'Addicted_Score'],
+                           df.loc[~is_feed, 'Addicted_Score'], 'greater', alpha, **bootstrap)
+
+
+def complicated_conflicts(df, alpha=ALPHA, **bootstrap):
+    title = "Статус 'Complicated' має найвищу частоту конфліктів"
+    is_complicated = df['Relationship_Status'] == 'Complicated'
+    result = _compare_groups(4, title, df.loc[is_complicated, 'Conflicts_Over_Social_Media'],
+                             df.loc[~is_complicated, 'Conflicts_Over_Social_Media'],
+                             'greater', alpha, **bootstrap)
+    means = df.groupby('Relationship_Status', observed=True)['Conflicts_Over_Social_Media'].mean()
+    result['confirmed'] = bool(result['confirmed'] and means.idxmax() == 'Complicated')
+    return result
+
+
+def relationship_protection(df, alpha=ALPHA, **bootstrap):
+    title = 'Стабільні стосунки знижують рівень залежності'
+    status = df['Relationship_Status']
+    return _compare_groups(5, title, df.loc[status == 'In Relationship', 'Addicted_Score'],
+                           df.loc[status == 'Single', 'Addicted_Score'], 'less', alpha, **bootstrap)
+
+
+def academic_impact(df, alpha=ALPHA, **bootstrap):
+    title = 'При Addicted_Score > 7 соцмережі завжди шкодять успішності'
+    test, effect_name = 'Частка «Так»', 'Частка'
+    affected = df.loc[df['Addicted_Score'] > 7, 'Affects_Academic_Performance_Numeric'].to_numpy('float64')
+    if len(affected) < 2:
+        return _no_data(6, title, test, effect_name)
+    share = affected.mean()
+    ci = bootstrap_ci(_mean, (affected,), alpha=alpha, **bootstrap)
+    # «У 100% випадків» — без p-value: гіпотеза підтверджується лише без винятків
+    return _result(6, title, test, effect_name, share, np.nan, ci, share == 1.0, len(affected))
+
+
+def region_comparison(df, alpha=ALPHA, **bootstrap):
+    title = 'Північна Америка має вищу залежність, ніж Європа'
+    region = df['Region']
+    return _compare_groups(7, title, df.loc[region == 'North America', 'Addicted_Score'],
+                           df.loc[region == 'Europe', 'Addicted_Score'], 'greater', alpha, **bootstrap)
+
+
+HYPOTHESES = [
+    sleep_vs_usage, mental_health_by_level, feed_platforms, complicated_conflicts,
+    relationship_protection, academic_impact, region_comparison,
+]
+
+
+def evaluate(df, n_resamples=N_RESAMPLES, alpha=ALPHA, seed=42, n_jobs=-1, numbers=None):
+    """Результати гіпотез (усіх або лише `numbers`), індексовані номером гіпотези."""
+    bootstrap = {'n_resamples': n_resamples, 'seed': seed, 'n_jobs': n_jobs}
+    rows = [
+        check(df, alpha=alpha, **bootstrap)
+        for number, check in enumerate(HYPOTHESES, start=1) if numbers is None or number in numbers
+    ]
+    return pd.DataFrame(rows).set_index('hypothesis')
+
+
+def save_results(results, version, path=HYPOTHESES_PATH):
+    """Зберігає результати разом з версією даних, на яких їх пораховано."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': version, 'results': json.loads(results.reset_index().to_json(orient='records'))},
+                  f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def load_results(version, path=HYPOTHESES_PATH):
+    """Збережені результати для версії даних `version` або None, якщо їх немає чи вони застаріли."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        saved = json.load(f)
+    if saved['version'] != version:
+        return None
+    results = pd.DataFrame(saved['results']).set_index('hypothesis')
+    # JSON не розрізняє NaN і відсутнє значення
+    return results.astype({col: 'float64' for col in ['effect', 'p_value', 'ci_low', 'ci_high']})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Перевірка гіпотез на обробленому датасеті.')
+    parser.add_argument('--data', default=PARQUET_PATH, help='оброблений датасет')
+    parser.add_argument('--resamples', type=int, default=N_RESAMPLES, help='кількість бутстреп-перевибірок')
+    parser.add_argument('--alpha', type=float, default=ALPHA, help='рівень значущості')
+    parser.add_argument('--jobs', type=int, default=-1, help='кількість процесів (-1 — усі ядра)')
+    args = parser.parse_args(argv)
+
+    df = read_dataset(args.data, columns=TEST_COLUMNS)
+    results = evaluate(df, args.resamples, args.alpha, n_jobs=args.jobs)
+    with pd.option_context('display.width', 200, 'display.max_colwidth', 60):
+        print(results.drop(columns='title').round(4).to_string())
+
+
+if __name__ == '__main__':
+    main()
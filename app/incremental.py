@@ -0,0 +1,83 @@
+"""Дописування нових респондентів без повної перезбірки датасету.
+
+Нові відповіді очищуються тими ж перетвореннями, що й у `pipeline.py`,
+отримують кластер від уже навченої моделі K-Means, а суми по групах
+оновлюються додаванням сум лише нової партії. Спершу записується частина,
+потім суми: якщо запуск упаде між цими кроками, наступний довраховує
+частину в суми (див. `aggregates.fold_parts`), а не додає її двічі:
+
+    python app/incremental.py new_responses.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from aggregates import SUMS_DIR, dataset_version, fold_parts, sums_files
+from model import MODEL_PATH, load_model, predict_clusters
+from pipeline import OUTPUT_COLUMNS, transform
+from storage import APPEND_DIR, PARQUET_PATH, append_part, dataset_files, read_dataset, write_lock
+from summary import SUMMARY_PATH, build_summary, load_summary, merge_summaries, save_summary
+
+
+def append_respondents(batch, data_path=PARQUET_PATH, append_dir=APPEND_DIR,
+                       sums_dir=SUMS_DIR, model_path=MODEL_PATH, model=None, summary_path=SUMMARY_PATH):
+    """Додає партію сирих відповідей до обробленого датасету.
+
+    Дублікати за `Student_ID` (всередині партії та з уже збереженими
+    рядками) відкидаються. Знімок для «Головної» оновлюється, лише якщо він
+    відповідав даним до дописування. Повертає кількість доданих і
+    пропущених рядків. Запис іде під `write_lock`, тож реліз дашборду не
+    знімається посеред дописування.
+    """
+    with write_lock(data_path):
+        return _append(batch, data_path, append_dir, sums_dir, model_path, model, summary_path)
+
+
+def _append(batch, data_path, append_dir, sums_dir, model_path, model, summary_path):
+    def current_version():
+        return dataset_version(*dataset_files(data_path, append_dir), *sums_files(sums_dir))
+
+    # 1. Суми доводяться до вже записаних частин (після збою попереднього
+    # запуску). Значення у знімку від цього не змінюються, лише версія.
+    summary = load_summary(summary_path)
+    if summary is not None and summary.pop('version') != current_version():
+        summary = None
+    fold_parts(dataset_files(data_path, append_dir)[1:], sums_dir)
+
+    # 2. Дедуплікація: з наявних даних читаємо лише колонку Student_ID
+    known_ids = read_dataset(data_path, columns=['Student_ID'], append_dir=append_dir)['Student_ID']
+    fresh = batch.drop_duplicates('Student_ID')
+    fresh = fresh[~np.isin(fresh['Student_ID'].to_numpy(), known_ids.to_numpy())]
+    skipped = len(batch) - len(fresh)
+
+    if not fresh.empty:
+        # 3. Очищення та кластери від збереженої моделі (без перенавчання)
+        new_rows = transform(fresh)
+        new_rows['Cluster'] = predict_clusters(model or load_model(model_path), new_rows)
+        new_rows = new_rows[OUTPUT_COLUMNS]
+
+        # 4. Спершу частина, потім суми: стара сума + сума нової частини
+        append_part(new_rows, append_dir)
+        fold_parts(dataset_files(data_path, append_dir)[1:], sums_dir)
+        if summary is not None:
+            summary = merge_summaries(summary, build_summary(new_rows))
+
+    # 5. Знімок для «Головної» — лише якщо він відповідав даним до дописування
+    if summary is not None:
+        save_summary(summary, current_version(), summary_path)
+
+    return {'added': len(fresh), 'skipped': skipped}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Дописування нових відповідей опитування.')
+    parser.add_argument('batch', help='CSV з новими відповідями (формат сирого датасету)')
+    args = parser.parse_args(argv)
+
+    result = append_respondents(pd.read_csv(args.batch))
+    print(f"Додано: {result['added']}, пропущено дублікатів: {result['skipped']}")
+
+
+if __name__ == '__main__':
+    main()
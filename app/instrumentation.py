@@ -0,0 +1,218 @@
+"""Опційне інструментування дашборду: час секцій, рядки, обсяг даних, кеші.
+
+Вмикається змінними середовища:
+
+    DASHBOARD_METRICS=1                  панель у боковій панелі
+    DASHBOARD_METRICS_LOG=metrics.jsonl  JSON-рядок на кожен перезапуск скрипта
+    DASHBOARD_METRICS_PROM=dash-{pid}.prom
+                                         лічильники у форматі Prometheus
+                                         (textfile collector node_exporter)
+
+Будь-яка з них вмикає запис. Вимкнене інструментування — це об'єкт-заглушка,
+тож код сторінок викликає його безумовно.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import pandas as pd
+
+
+METRICS_LOG = os.environ.get('DASHBOARD_METRICS_LOG')
+METRICS_PROM = os.environ.get('DASHBOARD_METRICS_PROM')
+ENABLED = os.environ.get('DASHBOARD_METRICS') == '1' or bool(METRICS_LOG or METRICS_PROM)
+
+logger = logging.getLogger('dashboard.metrics')
+if METRICS_LOG and not logger.handlers:
+    handler = logging.FileHandler(METRICS_LOG, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+# Кожна сесія Streamlit виконує скрипт у власному потоці
+_local = threading.local()
+
+
+class RerunMetrics:
+    """Вимірювання одного перезапуску скрипта."""
+
+    enabled = True
+
+    def __init__(self, page=None):
+        self.page = page
+        self.started = time.perf_counter()
+        self.sections = []
+        self.caches = defaultdict(lambda: {'calls': 0, 'misses': 0})
+        self._stack = []
+        self.total_seconds = None
+
+    @contextmanager
+    def section(self, name, rows=None):
+        """Замір секції; у словник, що повертається, можна дописати rows і payload_bytes."""
+        self._stack.append(name)
+        record = {'section': '/'.join(self._stack), 'rows': rows, 'payload_bytes': None}
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - started
+            self._stack.pop()
+            self.sections.append(record)
+
+    def cache_call(self, name):
+        self.caches[name]['calls'] += 1
+
+    def cache_miss(self, name):
+        self.caches[name]['misses'] += 1
+
+    def sections_frame(self):
+        columns = ['section', 'seconds', 'rows', 'payload_bytes']
+        return pd.DataFrame(self.sections, columns=columns)
+
+    def caches_frame(self):
+        frame = pd.DataFrame.from_dict(dict(self.caches), orient='index', columns=['calls', 'misses'])
+        frame['hits'] = frame['calls'] - frame['misses']
+        return frame.rename_axis('cache')
+
+    def finish(self):
+        """Завершує перезапуск і експортує виміри (один раз)."""
+        if self.total_seconds is not None:
+            return
+        self.total_seconds = time.perf_counter() - self.started
+        record = {
+            'ts': time.time(), 'page': self.page, 'total_seconds': self.total_seconds,
+            'sections': self.sections, 'caches': dict(self.caches),
+        }
+        if METRICS_LOG:
+            logger.info(json.dumps(record, ensure_ascii=False, default=str))
+        if METRICS_PROM:
+            registry.add(record)
+            registry.write(METRICS_PROM.format(pid=os.getpid()))
+
+
+class _Disabled:
+    enabled = False
+
+    @contextmanager
+    def section(self, name, rows=None):
+        yield {}
+
+    def cache_call(self, name):
+        pass
+
+    def cache_miss(self, name):
+        pass
+
+    def finish(self):
+        pass
+
+
+DISABLED = _Disabled()
+
+
+def start(page=None):
+    """Починає вимірювання перезапуску для поточної сесії."""
+    _local.metrics = RerunMetrics(page) if ENABLED else DISABLED
+    return _local.metrics
+
+
+def current():
+    return getattr(_local, 'metrics', DISABLED)
+
+
+def tracked(cache, name=None):
+    """Обгортає декоратор кешу Streamlit підрахунком викликів і промахів.
+
+    Тіло функції виконується лише при промаху, тож виклики поза кешем —
+    це всі звернення, а виклики тіла — промахи.
+    """
+    def decorator(func):
+        key = name or func.__name__
+
+        @functools.wraps(func)
+        def body(*args, **kwargs):
+            current().cache_miss(key)
+            return func(*args, **kwargs)
+
+        cached = cache(body)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            current().cache_call(key)
+            return cached(*args, **kwargs)
+
+        wrapper.clear = cached.clear
+        return wrapper
+    return decorator
+
+
+# --- ЕКСПОРТ ДЛЯ PROMETHEUS ---
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+class Registry:
+    """Накопичувальні лічильники процесу (між усіма сесіями)."""
+
+    COUNTERS = {
+        'dashboard_reruns_total': 'Перезапуски скрипта за сторінками',
+        'dashboard_rerun_seconds_total': 'Сумарний час перезапусків',
+        'dashboard_section_runs_total': 'Кількість виконань секції',
+        'dashboard_section_seconds_total': 'Сумарний час секції',
+        'dashboard_section_rows_total': 'Оброблено рядків у секції',
+        'dashboard_section_payload_bytes_total': 'Байтів, відданих секцією',
+        'dashboard_cache_calls_total': 'Звернення до кешу',
+        'dashboard_cache_misses_total': 'Промахи кешу',
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = defaultdict(float)
+
+    def _inc(self, metric, value, **labels):
+        if value:
+            self._values[(metric, _labels(**labels))] += value
+
+    def add(self, record):
+        page = record['page']
+        with self._lock:
+            self._inc('dashboard_reruns_total', 1, page=page)
+            self._inc('dashboard_rerun_seconds_total', record['total_seconds'], page=page)
+            for section in record['sections']:
+                labels = {'page': page, 'section': section['section']}
+                self._inc('dashboard_section_runs_total', 1, **labels)
+                self._inc('dashboard_section_seconds_total', section['seconds'], **labels)
+                self._inc('dashboard_section_rows_total', section['rows'], **labels)
+                self._inc('dashboard_section_payload_bytes_total', section['payload_bytes'], **labels)
+            for cache, counts in record['caches'].items():
+                self._inc('dashboard_cache_calls_total', counts['calls'], cache=cache)
+                self._inc('dashboard_cache_misses_total', counts['misses'], cache=cache)
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = []
+        for metric, help_text in self.COUNTERS.items():
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} counter']
+            lines += [f'{name}{labels} {value:.17g}' for (name, labels), value in values if name == metric]
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        # Атомарна заміна: колектор ніколи не читає напівзаписаний файл
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+registry = Registry()
@@ -0,0 +1,152 @@
+"""Кешовані завантажувачі даних, спільні для всіх сторінок дашборду.
+
+Модуль навмисно легкий (pandas, pyarrow, numpy): важкі залежності
+конкретних сторінок імпортуються в їхніх модулях у `views/`.
+"""
+import os
+
+import streamlit as st
+
+from aggregates import SUMS_DIR, aggregates_from_sums, build_aggregates, dataset_version, load_sums, sums_files
+from filters import INDEX_COLUMNS, BitmapIndex
+from figure_cache import FIGURE_CACHE_SIZE, FigureCache
+from instrumentation import current as current_metrics, tracked
+from refresh import (
+    APPEND_SUBDIR, DATA_FILE, REFRESH_INTERVAL, SUMMARY_FILE, SUMS_SUBDIR, Refresher, artifact_path,
+    current_release
+)
+from shared_store import is_published, open_dataset, open_sums
+from storage import APPEND_DIR, AGGREGATE_COLUMNS, PAGE_COLUMNS, PARQUET_PATH, dataset_files, read_dataset, read_preview
+from summary import SUMMARY_PATH, load_summary
+
+
+DATA_PATH = PARQUET_PATH
+
+# Багатокористувацький режим (DASHBOARD_SHARED=1): датасет і суми
+# відображаються в пам'ять з файлів Arrow (див. shared_store.py) і
+# віддаються всім сесіям одним об'єктом замість копії на кожен виклик.
+# Публікує фоновий потік; доки версію не опубліковано, читається Parquet.
+SHARED_SERVING = os.environ.get('DASHBOARD_SHARED') == '1'
+cache_dataset = st.cache_resource if SHARED_SERVING else st.cache_data
+
+# --- ВЕРСІЯ ДАНИХ ---
+# Фоновий потік знімає реліз, коли змінюються основні артефакти
+# (див. refresh.py). Один на процес, спільний для всіх сесій.
+@st.cache_resource
+def get_refresher():
+    return Refresher(publish=SHARED_SERVING).start()
+
+def resolve_version():
+    """Поточний реліз або, якщо релізів немає, хеш основних файлів.
+
+    Викликається один раз на перезапуск скрипта: усі завантажувачі
+    отримують цю версію, тож сесія не бачить заміну посеред рендеру.
+    З вимкненим фоновим оновленням релізи ніхто не оновлює, тож тоді
+    дашборд читає основні файли.
+    """
+    release = current_release() if REFRESH_INTERVAL > 0 else None
+    return release or dataset_version(*dataset_files(DATA_PATH), *sums_files())
+
+def serve_shared(version):
+    """Чи читати версію зі спільного сховища (лише вже опубліковану)."""
+    return SHARED_SERVING and is_published(version)
+
+# Шляхи артефактів версії: у релізі або основні
+def data_path(version):
+    return artifact_path(version, DATA_FILE, DATA_PATH)
+
+def append_dir(version):
+    # Частини релізу — знімок дописаних частин на момент збірки
+    return artifact_path(version, APPEND_SUBDIR, APPEND_DIR)
+
+def sums_dir(version):
+    return artifact_path(version, SUMS_SUBDIR, SUMS_DIR)
+
+# Версія (хеш вмісту файлу) входить у ключ кешу, тож оновлені дані
+# підхоплюються без перезапуску, а незмінені — не перераховуються.
+# Колонки теж входять у ключ: кожна сторінка читає лише те, що їй потрібно.
+# Обмеження кількості записів витісняє дані старих версій. Джерело (спільне
+# сховище чи Parquet) теж у ключі: після публікації копія з Parquet
+# більше не використовується і витісняється.
+def load_data(version, columns=None):
+    return _load_data(version, columns, serve_shared(version))
+
+@tracked(cache_dataset(max_entries=16), name='load_data')
+def _load_data(version, columns, mapped):
+    if mapped:
+        return open_dataset(version, columns)
+    df = read_dataset(data_path(version), columns=list(columns) if columns else None,
+                      append_dir=append_dir(version))
+    return df
+
+@tracked(st.cache_data(max_entries=4))
+def load_preview(version):
+    return read_preview(data_path(version))
+
+# Бітмап-індекс колонок фільтрів будується один раз на версію датасету
+@tracked(st.cache_resource(max_entries=2))
+def get_filter_index(version):
+    return BitmapIndex(load_data(version, tuple(INDEX_COLUMNS)))
+
+# Знімок з інжесту: «Головна» і списки фільтрів без завантаження датасету
+@tracked(st.cache_data(max_entries=4))
+def load_snapshot(version):
+    """Знімок для поточної версії даних або None, якщо він відсутній чи застарів."""
+    summary = load_summary(artifact_path(version, SUMMARY_FILE, SUMMARY_PATH))
+    if summary is None or summary.pop('version') != version:
+        return None
+    return summary
+
+def filter_values(version):
+    """Значення для віджетів фільтрів: зі знімка, інакше — з бітмап-індексу."""
+    summary = load_snapshot(version)
+    if summary is not None:
+        return summary['values']
+    index = get_filter_index(version)
+    return {col: index.values(col) for col in INDEX_COLUMNS}
+
+def load_view(version, columns, filters):
+    """Колонки датасету лише для рядків, що пройшли фільтри."""
+    df = load_data(version, columns)
+    if not filters:
+        return df
+    return df.iloc[get_filter_index(version).positions(filters)]
+
+def load_page(version, page, filters):
+    """Колонки, потрібні сторінці `page` (див. storage.PAGE_COLUMNS), з заміром."""
+    with current_metrics().section('load') as section:
+        df = load_view(version, tuple(PAGE_COLUMNS[page]), filters)
+        section['rows'] = len(df)
+    return df
+
+# Без фільтрів агрегати будуються зі збережених сум по групах, які пайплайн
+# і дописування нових респондентів (incremental.py) підтримують актуальними.
+# З фільтрами — тими самими групуваннями, але лише по відібраних рядках.
+@tracked(cache_dataset(max_entries=32))
+def load_aggregates(version, filters=()):
+    if not filters:
+        return aggregates_from_sums(open_sums(version) if serve_shared(version) else load_sums(sums_dir(version)))
+    return build_aggregates(load_view(version, tuple(AGGREGATE_COLUMNS), filters))
+
+# Готові фігури спільні для всіх сесій. Ключ — назва графіка, версія даних,
+# фільтри та параметри, від яких він залежить, тож перемикання віджетів,
+# що його не стосуються, не перебудовує фігуру.
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache(FIGURE_CACHE_SIZE)
+
+def cached_figure(key, build, *params):
+    """Фігура з кешу за ключем (назва, версія, фільтри) + `params`."""
+    metrics = current_metrics()
+    metrics.cache_call('figures')
+
+    def build_counted():
+        metrics.cache_miss('figures')
+        return build()
+
+    with metrics.section(key[0]) as section:
+        fig = get_figure_cache().get_or_build(tuple(key) + params, build_counted)
+    # Обсяг JSON фігури рахується поза заміром і лише з увімкненими метриками
+    if metrics.enabled:
+        section['payload_bytes'] = len(fig.to_json())
+    return fig
@@ -0,0 +1,175 @@
+"""Карта регіональних лідерів платформ без залежності від сторонніх серверів.
+
+Логотипи та бібліотека Leaflet завантажуються один раз у локальну теку
+(`python app/maps.py`, потрібен доступ до мережі) і вбудовуються прямо
+в HTML карти. Джерело тайлів задається змінною середовища `MAP_TILES`:
+URL-шаблон локального тайл-сервера, назва вбудованого шару folium або
+`none` — карта без підкладки.
+
+Якщо локальної копії логотипа немає, використовується посилання на
+Wikimedia, а з `MAP_OFFLINE=1` — текстова позначка з назвою платформи.
+В офлайн-режимі підкладки за замовчуванням немає, а без локальної копії
+Leaflet карта не будується (`OfflineAssetsError`), щоб HTML не посилався
+на CDN.
+"""
+import base64
+import os
+import re
+import urllib.request
+
+import folium
+import numpy as np
+
+
+ASSET_DIR = 'data/assets/map'
+
+PLATFORM_LOGOS = {
+    "Instagram": "https://upload.wikimedia.org/wikipedia/commons/e/e7/Instagram_logo_2016.svg",
+    "TikTok": "https://upload.wikimedia.org/wikipedia/en/a/a9/TikTok_logo.svg",
+    "Facebook": "https://upload.wikimedia.org/wikipedia/commons/b/b8/2021_Facebook_icon.svg"
+}
+
+# Карті потрібен лише Leaflet; інші бібліотеки folium (bootstrap, jquery) не підключаються
+LEAFLET_JS = ('leaflet', 'https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js')
+LEAFLET_CSS = ('leaflet_css', 'https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css')
+
+# Координати центрів (підправлені для кращого вигляду)
+REGION_COORDS = {
+    "Europe": [50, 15],
+    "Asia": [35, 90],
+    "North America": [45, -100],
+    "South America": [-15, -60],
+    "Oceania": [-25, 135],
+    "Africa": [5, 20]
+}
+
+# PositronNoLabels — карта без тексту
+DEFAULT_TILES = 'https://{s}.basemaps.cartocdn.com/light_nolabels/{z}/{x}/{y}{r}.png'
+DEFAULT_ATTR = (
+    '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors '
+    '&copy; <a href="https://carto.com/attributions">CARTO</a>'
+)
+MAP_OFFLINE = os.environ.get('MAP_OFFLINE') == '1'
+# Офлайн стандартні тайли недоступні: без явного MAP_TILES — без підкладки
+MAP_TILES = os.environ.get('MAP_TILES', 'none' if MAP_OFFLINE else DEFAULT_TILES)
+MAP_ATTR = os.environ.get('MAP_ATTR', DEFAULT_ATTR)
+
+
+class OfflineAssetsError(FileNotFoundError):
+    """В офлайн-режимі немає локальної копії Leaflet."""
+
+
+def _asset_path(url, asset_dir=ASSET_DIR):
+    return os.path.join(asset_dir, os.path.basename(url))
+
+
+def assets_state(asset_dir=ASSET_DIR):
+    """Назви та час зміни локальних копій: частина ключа кешу готового HTML."""
+    urls = list(PLATFORM_LOGOS.values()) + [LEAFLET_JS[1], LEAFLET_CSS[1]]
+    paths = [_asset_path(url, asset_dir) for url in urls]
+    return tuple((os.path.basename(path), os.path.getmtime(path)) for path in paths if os.path.exists(path))
+
+
+def missing_leaflet(asset_dir=ASSET_DIR):
+    """Файли Leaflet, яких немає в `asset_dir` (порожній список — усе на місці)."""
+    return [os.path.basename(url) for _, url in (LEAFLET_JS, LEAFLET_CSS)
+            if not os.path.exists(_asset_path(url, asset_dir))]
+
+
+def fetch_assets(asset_dir=ASSET_DIR):
+    """Завантажує логотипи та Leaflet у `asset_dir` (один раз, поки є мережа)."""
+    os.makedirs(asset_dir, exist_ok=True)
+    urls = list(PLATFORM_LOGOS.values()) + [LEAFLET_JS[1], LEAFLET_CSS[1]]
+    for url in urls:
+        request = urllib.request.Request(url, headers={'User-Agent': 'digital-health-dashboard'})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            content = response.read()
+        tmp_path = f'{_asset_path(url, asset_dir)}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, _asset_path(url, asset_dir))
+    return urls
+
+
+def logo_url(platform, asset_dir=ASSET_DIR, offline=MAP_OFFLINE):
+    """Data URL локального логотипа, віддалене посилання або None."""
+    url = PLATFORM_LOGOS.get(platform)
+    if not url:
+        return None
+    path = _asset_path(url, asset_dir)
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            encoded = base64.b64encode(f.read()).decode('ascii')
+        return f'data:image/svg+xml;base64,{encoded}'
+    return None if offline else url
+
+
+def _inline_assets(html, asset_dir=ASSET_DIR):
+    """Замінює посилання на Leaflet вмістом локальних копій, якщо вони є."""
+    js_path, css_path = _asset_path(LEAFLET_JS[1], asset_dir), _asset_path(LEAFLET_CSS[1], asset_dir)
+    if os.path.exists(js_path):
+        with open(js_path, encoding='utf-8') as f:
+            script = f.read()
+        html = re.sub(rf'<script src="{re.escape(LEAFLET_JS[1])}"></script>',
+                      lambda _: f'<script>{script}</script>', html)
+    if os.path.exists(css_path):
+        with open(css_path, encoding='utf-8') as f:
+            style = f.read()
+        html = re.sub(rf'<link rel="stylesheet" href="{re.escape(LEAFLET_CSS[1])}"\s*/>',
+                      lambda _: f'<style>{style}</style>', html)
+    return html
+
+
+def leaders_map_html(top_reg, tiles=MAP_TILES, attr=MAP_ATTR, asset_dir=ASSET_DIR, offline=MAP_OFFLINE):
+    """Самодостатній HTML карти лідерів платформ за регіонами.
+
+    В офлайн-режимі без локальної копії Leaflet — `OfflineAssetsError`.
+    """
+    missing = missing_leaflet(asset_dir) if offline else []
+    if missing:
+        raise OfflineAssetsError(f"Немає локальної копії Leaflet ({', '.join(missing)}); "
+                                 "запустіть `python app/maps.py`, поки є мережа")
+    m = folium.Map(
+        location=[20, 0],
+        zoom_start=2,
+        tiles=None if tiles == 'none' else tiles,
+        attr=attr
+    )
+    m.default_js = [LEAFLET_JS]
+    m.default_css = [LEAFLET_CSS]
+
+    for _, row in top_reg.iterrows():
+        region = row['Region']
+        count = row['Count']
+        platform = row['Most_Used_Platform']
+
+        if region not in REGION_COORDS:
+            continue
+        # ФОРМУЛА РОЗМІРУ:
+        # Базовий розмір 40px + приріст на основі кореня від кількості
+        # Це зробить малі значення (як у Пд. Америці) помітними
+        icon_size = 40 + (np.sqrt(count) * 4)
+
+        tooltip = f"<b>{region}</b><br>Платформа: {platform}<br>Кількість: {count}"
+        url = logo_url(platform, asset_dir, offline)
+        if url:
+            icon = folium.CustomIcon(url, icon_size=(icon_size, icon_size))
+        elif platform in PLATFORM_LOGOS:
+            # Офлайн без локального логотипа: кружок з назвою платформи
+            icon = folium.DivIcon(
+                icon_size=(icon_size, icon_size),
+                icon_anchor=(icon_size / 2, icon_size / 2),
+                html=(f'<div style="width:{icon_size:.0f}px;height:{icon_size:.0f}px;border-radius:50%;'
+                      f'background:#444;color:#fff;display:flex;align-items:center;'
+                      f'justify-content:center;font:bold 11px sans-serif">{platform}</div>')
+            )
+        else:
+            continue
+        folium.Marker(location=REGION_COORDS[region], icon=icon, tooltip=tooltip).add_to(m)
+
+    return _inline_assets(m.get_root().render(), asset_dir)
+
+
+if __name__ == '__main__':
+    for url in fetch_assets():
+        print(f"Збережено '{_asset_path(url)}'")
@@ -0,0 +1,109 @@
+"""Модель K-Means, що розбиває респондентів на кластери.
+
+Модель навчається в `pipeline.py` і зберігається на диск, щоб нові рядки
+можна було віднести до кластерів без повторного навчання. Оцінювання
+(`score`) приймає як відповіді одного користувача, так і цілий DataFrame.
+"""
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.cluster import KMeans
+from sklearn.preprocessing import StandardScaler
+
+
+MODEL_PATH = 'models/kmeans.joblib'
+# Версія формату артефакту; змінюється, коли змінюється його структура
+MODEL_VERSION = 1
+
+# Ознаки для кластеризації
+CLUSTER_FEATURES = [
+    'Avg_Daily_Usage_Hours',
+    'Sleep_Hours_Per_Night',
+    'Mental_Health_Score',
+    'Addicted_Score'
+]
+N_CLUSTERS = 3
+# Рівні профілю для кластерів, упорядкованих за середнім Addicted_Score
+PROFILE_LEVELS = ['Low', 'Medium', 'High']
+
+
+def make_artifact(scaler, kmeans):
+    """Навчені scaler і K-Means разом з метаданими для збереження."""
+    return {
+        'version': MODEL_VERSION,
+        'sklearn_version': sklearn.__version__,
+        'features': CLUSTER_FEATURES,
+        'scaler': scaler,
+        'kmeans': kmeans,
+    }
+
+
+def fit_model(df, n_clusters=N_CLUSTERS):
+    # Стандартизація, щоб усі ознаки мали однаковий вплив
+    scaler = StandardScaler().fit(df[CLUSTER_FEATURES])
+    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+    kmeans.fit(scaler.transform(df[CLUSTER_FEATURES]))
+    return make_artifact(scaler, kmeans)
+
+
+def predict_clusters(model, df):
+    # Ознаки з Parquet мають зменшені типи (float32, int8); модель навчена на float64
+    x_scaled = model['scaler'].transform(df[model['features']].astype('float64'))
+    return model['kmeans'].predict(x_scaled)
+
+
+def score(model, data):
+    """Кластер і відстань до його центроїда для одного або багатьох респондентів.
+
+    `data` — словник з відповідями одного користувача або DataFrame;
+    результат — DataFrame з колонками `Cluster` і `Distance` (відстань
+    у стандартизованому просторі ознак) з тим самим індексом.
+    """
+    df = pd.DataFrame([data]) if isinstance(data, dict) else data
+    x_scaled = model['scaler'].transform(df[model['features']])
+    # Відстані до всіх центроїдів одним викликом, далі — найближчий
+    distances = model['kmeans'].transform(x_scaled)
+    clusters = distances.argmin(axis=1)
+    return pd.DataFrame({
+        'Cluster': clusters,
+        'Distance': distances[np.arange(len(clusters)), clusters],
+    }, index=df.index)
+
+
+def cluster_levels(model):
+    """Рівень профілю (Low/Medium/High) для кожного номера кластера."""
+    centers = model['scaler'].inverse_transform(model['kmeans'].cluster_centers_)
+    addicted = centers[:, model['features'].index('Addicted_Score')]
+    order = np.argsort(addicted)
+    levels = np.array(PROFILE_LEVELS)[np.linspace(0, len(PROFILE_LEVELS) - 1, len(order)).round().astype(int)]
+    return dict(zip(order.tolist(), levels.tolist()))
+
+
+def save_model(model, path=MODEL_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def saved_clusters(path=MODEL_PATH):
+    """Кількість кластерів збереженої моделі або `N_CLUSTERS`, якщо моделі немає.
+
+    Так вибір `clustering.py --k` зберігається між перезбірками.
+    """
+    if not os.path.exists(path):
+        return N_CLUSTERS
+    return load_model(path)['kmeans'].n_clusters
+
+
+def load_model(path=MODEL_PATH):
+    model = joblib.load(path)
+    if model.get('version') != MODEL_VERSION:
+        raise ValueError(
+            f"Модель '{path}' має версію {model.get('version')}, очікується {MODEL_VERSION}. "
+            "Перезберіть її: python app/pipeline.py"
+        )
+    return model
@@ -0,0 +1,137 @@
+"""Пайплайн очищення: сирий CSV опитування → оброблений датасет.
+
+Повторює кроки з `notebooks/full_analysis.ipynb`, але без ноутбука:
+
+    python app/pipeline.py --raw "data/raw/Students Social Media Addiction.csv"
+
+Сирий експорт — джерело всіх респондентів: повна збірка замінює датасет
+і видаляє частини, дописані після попередньої збірки (`incremental.py`),
+щоб рядки, суми по групах і знімок «Головної» описували ті самі дані.
+Кількість кластерів — `--k`, а без нього — як у збереженій моделі, тож
+вибір `clustering.py --k` не губиться під час перезбірки.
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from aggregates import SUMS_DIR, dataset_version, group_sums, save_sums, sums_files
+from countries import country_table
+from hypotheses import HYPOTHESES_PATH, SAMPLE_ROWS, TEST_COLUMNS, evaluate, save_results
+from model import MODEL_PATH, N_CLUSTERS, fit_model, save_model, saved_clusters
+from storage import (
+    APPEND_DIR, CSV_PATH, PARQUET_PATH, clear_appended, dataset_files, sample_dataset, write_dataset, write_lock
+)
+from summary import SUMMARY_PATH, build_summary, save_summary, summarize_parquet
+
+
+RAW_PATH = 'data/raw/Students Social Media Addiction.csv'
+
+# 1-3: Low, 4-7: Medium, 8-10: High
+ADDICTION_BINS = [-np.inf, 3, 7, np.inf]
+ADDICTION_LABELS = ['Low', 'Medium', 'High']
+
+PLATFORM_TYPES = {
+    'TikTok': 'Entertain-Scroll', 'Instagram': 'Entertain-Scroll',
+    'YouTube': 'Entertain-Scroll', 'Snapchat': 'Entertain-Scroll',
+    'Facebook': 'Social-Network', 'Twitter': 'Social-Network', 'VKontakte': 'Social-Network',
+    'WhatsApp': 'Direct-Messaging', 'LINE': 'Direct-Messaging',
+    'WeChat': 'Direct-Messaging', 'KakaoTalk': 'Direct-Messaging',
+    'LinkedIn': 'Professional'
+}
+
+# Порядок колонок у processed-файлі
+OUTPUT_COLUMNS = [
+    'Student_ID', 'Age', 'Gender', 'Academic_Level', 'Country', 'Avg_Daily_Usage_Hours',
+    'Most_Used_Platform', 'Affects_Academic_Performance', 'Sleep_Hours_Per_Night',
+    'Mental_Health_Score', 'Relationship_Status', 'Conflicts_Over_Social_Media',
+    'Addicted_Score', 'Affects_Academic_Performance_Numeric', 'Addiction_Level',
+    'Cluster', 'Region', 'Platform_Type'
+]
+
+
+def resolve_regions(countries):
+    """Континент для кожної країни одним join з таблицею країн (див. countries.py)."""
+    return countries.map(country_table(countries)['Region'])
+
+
+def categorize_addiction(scores):
+    return pd.cut(scores, bins=ADDICTION_BINS, labels=ADDICTION_LABELS)
+
+
+def transform(df):
+    """Похідні колонки, які рахуються незалежно для кожного рядка."""
+    df = df.copy()
+    df['Affects_Academic_Performance_Numeric'] = df['Affects_Academic_Performance'].map({'Yes': 1, 'No': 0})
+    df['Addiction_Level'] = categorize_addiction(df['Addicted_Score'])
+    df['Region'] = resolve_regions(df['Country'])
+    df['Platform_Type'] = df['Most_Used_Platform'].map(PLATFORM_TYPES)
+    return df
+
+
+def clean(raw, n_clusters=N_CLUSTERS):
+    """Повний цикл очищення сирого датасету.
+
+    Повертає очищений датасет і навчену на ньому модель K-Means.
+    """
+    df = transform(raw)
+    model = fit_model(df, n_clusters)
+    df['Cluster'] = model['kmeans'].labels_
+    return df[OUTPUT_COLUMNS], model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Очищення сирого датасету опитування.')
+    parser.add_argument('--raw', default=RAW_PATH, help='сирий CSV опитування')
+    parser.add_argument('--out', default=PARQUET_PATH, help='куди записати Parquet')
+    parser.add_argument('--csv', default=CSV_PATH, help="копія у CSV ('' — не писати)")
+    parser.add_argument('--sums-dir', default=SUMS_DIR, help='куди записати суми по групах')
+    parser.add_argument('--model', default=MODEL_PATH, help='куди записати модель K-Means')
+    parser.add_argument('--summary', default=SUMMARY_PATH, help='куди записати знімок для «Головної»')
+    parser.add_argument('--hypotheses', default=HYPOTHESES_PATH, help='куди записати результати перевірки гіпотез')
+    parser.add_argument('--append-dir', default=APPEND_DIR, help='дописані частини, які замінює збірка')
+    parser.add_argument('--k', type=int, help='кількість кластерів (за замовчуванням — як у збереженій моделі)')
+    parser.add_argument('--chunksize', type=int, default=0,
+                        help='потоковий режим: читати сирий файл частинами по N рядків')
+    args = parser.parse_args(argv)
+
+    # Дашборд знімає реліз лише тоді, коли файли не переписуються (див. refresh.py)
+    with write_lock(args.out):
+        n_clusters = args.k or saved_clusters(args.model)
+
+        if args.chunksize:
+            from streaming import stream_build
+
+            sums, model = stream_build(args.raw, args.out, args.csv, args.chunksize, n_clusters)
+            clear_appended(args.append_dir)
+            save_sums(sums, args.sums_dir)
+            save_model(model, args.model)
+            version = dataset_version(*dataset_files(args.out, args.append_dir), *sums_files(args.sums_dir))
+            save_summary(summarize_parquet(args.out), version, args.summary)
+            # Бутстреп потребує рядків у пам'яті, тож у потоковому режимі тести
+            # рахуються на вибірці обмеженого розміру, прочитаній пакетами
+            test_data = sample_dataset(args.out, TEST_COLUMNS, SAMPLE_ROWS, args.append_dir, batch_size=args.chunksize)
+            save_results(evaluate(test_data), version, args.hypotheses)
+            print(f"Оброблено {int(sums['region']['n'].sum())} рядків (потоково) → '{args.out}'")
+            print(f"Гіпотези перевірено на вибірці з {len(test_data)} рядків")
+            print(sums['region']['n'].astype('int64').sort_values(ascending=False).to_string())
+            return
+
+        df, model = clean(pd.read_csv(args.raw), n_clusters)
+        write_dataset(df, args.out)
+        clear_appended(args.append_dir)
+        save_sums(group_sums(df), args.sums_dir)
+        save_model(model, args.model)
+        # Знімок і тести пишуться останніми: їхня версія — хеш уже записаних даних і сум
+        version = dataset_version(*dataset_files(args.out, args.append_dir), *sums_files(args.sums_dir))
+        save_summary(build_summary(df), version, args.summary)
+        save_results(evaluate(df[TEST_COLUMNS]), version, args.hypotheses)
+        if args.csv:
+            df.to_csv(args.csv, index=False)
+
+        print(f"Оброблено {len(df)} рядків → '{args.out}'")
+        print(df['Region'].value_counts().to_string())
+
+
+if __name__ == '__main__':
+    main()
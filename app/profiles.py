@@ -0,0 +1,130 @@
+"""Пакетна діагностика цифрового профілю для CSV з анкетами.
+
+Той самий розрахунок, що й на сторінці «ML Діагностика», але для тисяч
+анкет одразу: перевірка відповідей, кластер, відстань і рівень профілю
+рахуються векторно для цілої частини файлу. Файл читається й пишеться
+частинами по `CHUNK_ROWS` рядків, тож пам'ять не залежить від його розміру.
+
+Колонки анкети — ознаки моделі (`model.CLUSTER_FEATURES`) або короткі
+назви полів форми (`usage`, `sleep`, `mental`, `addicted`), але не обидві
+назви однієї ознаки разом; решта колонок переноситься в результат без
+змін. Рядки з помилками не оцінюються, а отримують опис помилки в колонці
+`Error`. Без дашборду:
+
+    python app/profiles.py intake.csv profiles.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from model import CLUSTER_FEATURES, MODEL_PATH, cluster_levels, load_model, score
+
+
+CHUNK_ROWS = 50_000
+HOURS_PER_DAY = 24
+# Короткі назви полів форми → колонки датасету
+INPUT_ALIASES = {
+    'usage': 'Avg_Daily_Usage_Hours',
+    'sleep': 'Sleep_Hours_Per_Night',
+    'mental': 'Mental_Health_Score',
+    'addicted': 'Addicted_Score',
+}
+# Допустимі значення — ті самі межі, що й у віджетів сторінки
+VALID_RANGES = {
+    'Avg_Daily_Usage_Hours': (0, 24),
+    'Sleep_Hours_Per_Night': (0, 12),
+    'Mental_Health_Score': (1, 10),
+    'Addicted_Score': (1, 10),
+}
+RESULT_COLUMNS = ['Error', 'Cluster', 'Distance', 'Profile']
+
+
+def validate(df):
+    """Числові ознаки та опис помилок для кожного рядка ('' — рядок коректний)."""
+    features = pd.DataFrame({col: pd.to_numeric(df[col], errors='coerce') for col in CLUSTER_FEATURES},
+                            index=df.index)
+    checks = []
+    for col, (low, high) in VALID_RANGES.items():
+        checks.append((features[col].isna(), f'{col}: порожнє або не число'))
+        checks.append((~features[col].between(low, high) & features[col].notna(), f'{col}: поза межами {low}–{high}'))
+    hours = features['Avg_Daily_Usage_Hours'] + features['Sleep_Hours_Per_Night']
+    checks.append((hours > HOURS_PER_DAY, f'сума годин у мережі та сну перевищує {HOURS_PER_DAY}'))
+
+    # Маски всіх перевірок — матриця рядки × перевірки; повідомлення
+    # рядка — повідомлення перевірок, що спрацювали, через '; '
+    masks = np.column_stack([mask.to_numpy() for mask, _ in checks])
+    messages = np.array([message + '; ' for _, message in checks], dtype=object)
+    errors = np.where(masks, messages, '').sum(axis=1) if len(df) else np.array([], dtype=object)
+    return features, pd.Series(errors, index=df.index, dtype=object).str.rstrip('; ')
+
+
+def diagnose_frame(df, model, levels=None):
+    """Анкети `df` з доданими колонками `RESULT_COLUMNS`.
+
+    `levels` — результат `cluster_levels(model)`; передається, щоб не
+    рахувати його для кожної частини файлу.
+    """
+    # Коротка й повна назва тієї самої ознаки (або повтор колонки) дали б
+    # після перейменування дві колонки з однаковою назвою
+    names = pd.Series([INPUT_ALIASES.get(col, col) for col in df.columns])
+    duplicated = [col for col in names[names.duplicated()].unique() if col in CLUSTER_FEATURES]
+    if duplicated:
+        raise ValueError(f"Ознаку задано кількома колонками: {', '.join(duplicated)}")
+    df = df.rename(columns=INPUT_ALIASES)
+    missing = [col for col in CLUSTER_FEATURES if col not in df]
+    if missing:
+        raise ValueError(f"У файлі немає колонок: {', '.join(missing)}")
+    levels = cluster_levels(model) if levels is None else levels
+
+    features, errors = validate(df)
+    valid = (errors == '').to_numpy()
+    cluster = np.full(len(df), -1)
+    distance = np.full(len(df), np.nan)
+    if valid.any():
+        scored = score(model, features[valid])
+        cluster[valid] = scored['Cluster'].to_numpy()
+        distance[valid] = scored['Distance'].to_numpy()
+
+    # Рівень профілю — вибірка з таблиці рівнів за номером кластера;
+    # останній елемент (індекс -1) — для неоцінених рядків
+    lookup = np.array([levels[i] for i in range(len(levels))] + [None], dtype=object)
+    result = df.copy()
+    result['Error'] = errors
+    result['Cluster'] = pd.Series(cluster, index=df.index, dtype='Int64').where(valid)
+    result['Distance'] = distance
+    result['Profile'] = lookup[cluster]
+    return result
+
+
+def diagnose_csv(source, target, model, chunksize=CHUNK_ROWS):
+    """Діагностика CSV `source` частинами з записом результатів у `target`.
+
+    `source` і `target` — шляхи або відкриті файли (`target` — бінарний
+    або текстовий). Повертає кількість анкет за рівнями профілю та
+    некоректних рядків (ключ 'Error').
+    """
+    if isinstance(target, str):
+        with open(target, 'wb') as f:
+            return diagnose_csv(source, f, model, chunksize)
+    levels = cluster_levels(model)
+    keys = list(dict.fromkeys(levels.values())) + ['Error']
+    counts = pd.Series(0, index=keys)
+    for i, chunk in enumerate(pd.read_csv(source, chunksize=chunksize)):
+        result = diagnose_frame(chunk, model, levels)
+        result.to_csv(target, index=False, header=i == 0, encoding='utf-8')
+        counts = counts.add(result['Profile'].value_counts(), fill_value=0)
+        counts['Error'] += int((result['Error'] != '').sum())
+    return counts.reindex(keys).astype(int)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Пакетна діагностика цифрового профілю')
+    parser.add_argument('source', help='CSV з анкетами')
+    parser.add_argument('target', help='CSV для результатів')
+    parser.add_argument('--model', default=MODEL_PATH, help='файл моделі K-Means')
+    parser.add_argument('--chunksize', type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    counts = diagnose_csv(args.source, args.target, load_model(args.model), args.chunksize)
+    print(counts.to_string())
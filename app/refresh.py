@@ -0,0 +1,332 @@
+"""Фонове оновлення обробленого датасету з атомарною заміною версій.
+
+Джерело — основні артефакти, які пишуть `pipeline.py`, `incremental.py`,
+`clustering.py --k` і `storage.py`: Parquet з дописаними частинами, суми
+по групах, модель K-Means, а також `cleaned_data.csv`. Коли будь-що з
+них змінюється, `Refresher` у фоновому потоці збирає реліз — знімок цих
+файлів. Реліз нічого не перераховує: файли переносяться жорсткими
+посиланнями, а знімок «Головної» та результати перевірки гіпотез —
+лише якщо вони записані для тих самих даних (інакше дашборд рахує їх
+сам, див. `views/verdicts.py`). Знімок знімається під блокуванням
+запису (`storage.write_lock`), тож не поєднує файли різних запусків.
+
+Якщо змінився лише `cleaned_data.csv` (його замінили вручну), він
+спершу конвертується в Parquet окремим процесом, частинами
+(`python app/storage.py`), а реліз знімається з результату.
+
+Реліз пишеться у тимчасову теку, атомарно перейменовується на
+`releases/<версія>`, і лише після цього файл `CURRENT` (теж атомарно)
+починає вказувати на нову версію. Незавершений реліз ніколи не видно.
+
+Кожен перезапуск скрипта один раз читає поточну версію й передає її всім
+завантажувачам, тож сесія, що вже рендериться, дочитує свою версію до
+кінця. Релізи не змінюються після запису; зберігаються останні
+`KEEP_RELEASES`. Кілька процесів дашборду не збирають реліз одночасно:
+збирає той, хто взяв файл блокування. У багатокористувацькому режимі той
+самий потік публікує поточний реліз у спільне сховище (`shared_store.py`).
+Разова збірка без дашборду:
+
+    python app/refresh.py
+"""
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+from aggregates import SUMS_DIR, dataset_version, fold_parts, sums_files
+from shared_store import is_published, publish_release
+from storage import APPEND_DIR, CSV_PATH, PARQUET_PATH, dataset_files, file_lock, write_lock
+from summary import SUMMARY_PATH, load_summary
+
+
+RELEASES_DIR = 'data/processed/releases'
+CURRENT_FILE = 'CURRENT'
+LOCK_FILE = '.build.lock'
+KEEP_RELEASES = 2
+# Як часто перевіряти джерело (секунд); 0 вимикає фонове оновлення
+REFRESH_INTERVAL = float(os.environ.get('DASHBOARD_REFRESH_INTERVAL', 60))
+
+# Файли всередині релізу
+DATA_FILE = 'cleaned_data.parquet'
+APPEND_SUBDIR = 'appended'
+SUMS_SUBDIR = 'aggregates'
+SUMMARY_FILE = 'summary.json'
+MODEL_FILE = 'kmeans.joblib'
+HYPOTHESES_FILE = 'hypotheses.json'
+SOURCE_FILE = 'source.json'
+
+STORAGE_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'storage.py')
+
+
+def release_dir(version, root=RELEASES_DIR):
+    return os.path.join(root, version)
+
+
+def artifact_path(version, name, default, root=RELEASES_DIR):
+    """Шлях артефакту `name` у релізі `version`; для версій поза релізами — `default`."""
+    directory = release_dir(version, root)
+    return os.path.join(directory, name) if os.path.isdir(directory) else default
+
+
+def current_release(root=RELEASES_DIR):
+    """Версія, на яку вказує `CURRENT`, або None, якщо релізів ще немає."""
+    try:
+        with open(os.path.join(root, CURRENT_FILE), encoding='utf-8') as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return version if os.path.isdir(release_dir(version, root)) else None
+
+
+def source_paths(paths=None):
+    """Шляхи основних артефактів; `paths` перевизначає окремі з них.
+
+    Модулі моделі й гіпотез (scikit-learn, scipy) імпортуються лише тут,
+    тобто у фоновому потоці, а не під час показу сторінки.
+    """
+    from hypotheses import HYPOTHESES_PATH
+    from model import MODEL_PATH
+
+    defaults = {
+        'data': PARQUET_PATH, 'append_dir': APPEND_DIR, 'sums': SUMS_DIR, 'model': MODEL_PATH,
+        'summary': SUMMARY_PATH, 'hypotheses': HYPOTHESES_PATH, 'csv': CSV_PATH,
+    }
+    return {**defaults, **(paths or {})}
+
+
+def source_state(paths):
+    """Хеші основних артефактів (`paths` — з `source_paths`); частини — за назвами."""
+    data_path, *parts = dataset_files(paths['data'], paths['append_dir'])
+    return {
+        'data_version': dataset_version(data_path),
+        'parts': {os.path.basename(part): dataset_version(part) for part in parts},
+        'sums_version': dataset_version(*sums_files(paths['sums'])),
+        'model_version': dataset_version(paths['model']),
+        'csv_version': dataset_version(paths['csv']) if os.path.exists(paths['csv']) else None,
+    }
+
+
+def state_version(state):
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def release_source(version, root=RELEASES_DIR):
+    """Стан джерела, з якого зібрано реліз (див. `source_state`), і його версія."""
+    with open(os.path.join(release_dir(version, root), SOURCE_FILE), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def csv_replaced(built_from, state):
+    """Чи змінився CSV без зміни Parquet, тобто його замінили поза інжестом.
+
+    Інжест пише CSV разом із Parquet під одним блокуванням, тож реліз
+    бачить або обидва старі файли, або обидва нові.
+    """
+    return (built_from is not None and state['csv_version'] is not None
+            and state['csv_version'] != built_from.get('csv_version')
+            and state['data_version'] == built_from.get('data_version'))
+
+
+def convert_csv(paths, data_version):
+    """Конвертує CSV в основні артефакти окремим процесом (потоково, див. storage.py).
+
+    Процес чекає на блокування запису й нічого не робить, якщо Parquet
+    тим часом переписали (`data_version` — версія, яку замінює CSV).
+    """
+    args = [sys.executable, STORAGE_SCRIPT, '--csv', paths['csv'], '--out', paths['data'],
+            '--append-dir', paths['append_dir'], '--sums-dir', paths['sums'], '--summary', paths['summary'],
+            '--expect-version', data_version]
+    result = subprocess.run(args, capture_output=True, text=True)
+    if result.returncode:
+        lines = result.stderr.strip().splitlines()
+        raise RuntimeError(f"Не вдалося конвертувати '{paths['csv']}': {lines[-1] if lines else result.returncode}")
+
+
+def _set_current(version, root):
+    tmp_path = os.path.join(root, f'{CURRENT_FILE}.{uuid.uuid4().hex}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(tmp_path, os.path.join(root, CURRENT_FILE))
+
+
+def build_lock(root=RELEASES_DIR):
+    """Блокування збірки релізу; дає False, якщо реліз уже збирає інший процес."""
+    return file_lock(os.path.join(root, LOCK_FILE), wait=False)
+
+
+def _link(src, dst):
+    # Основні файли замінюються атомарно (новий файл), а не змінюються на
+    # місці, тож посилання лишається знімком вмісту на момент збірки
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _link_if_current(src, dst, version, load):
+    # Знімок «Головної» чи результати тестів — лише для тих самих даних
+    saved = load(src) if os.path.exists(src) else None
+    if saved is not None and saved.get('version') == version:
+        _link(src, dst)
+
+
+def _stage(tmp_dir, paths):
+    """Знімок основних артефактів у `tmp_dir`; повертає версію даних."""
+    _link(paths['data'], os.path.join(tmp_dir, DATA_FILE))
+    _link(paths['model'], os.path.join(tmp_dir, MODEL_FILE))
+    parts_dir = os.path.join(tmp_dir, APPEND_SUBDIR)
+    parts = dataset_files(paths['data'], paths['append_dir'])[1:]
+    if parts:
+        os.makedirs(parts_dir)
+    for part in parts:
+        _link(part, os.path.join(parts_dir, os.path.basename(part)))
+    sums_dir = os.path.join(tmp_dir, SUMS_SUBDIR)
+    os.makedirs(sums_dir)
+    for path in sums_files(paths['sums']):
+        _link(path, os.path.join(sums_dir, os.path.basename(path)))
+    # Після збою дописування частина могла не потрапити в суми; оновлена
+    # таблиця замінює посилання, основні файли не змінюються
+    if parts:
+        fold_parts(dataset_files(os.path.join(tmp_dir, DATA_FILE), parts_dir)[1:], sums_dir)
+
+    # Та сама формула версії, що й для основних файлів у дашборді
+    version = dataset_version(*dataset_files(os.path.join(tmp_dir, DATA_FILE), parts_dir), *sums_files(sums_dir))
+    _link_if_current(paths['summary'], os.path.join(tmp_dir, SUMMARY_FILE), version, load_summary)
+    _link_if_current(paths['hypotheses'], os.path.join(tmp_dir, HYPOTHESES_FILE), version, _load_json)
+    return version
+
+
+def _load_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_release(paths=None, root=RELEASES_DIR):
+    """Знімає реліз з основних артефактів і робить його поточним; повертає версію.
+
+    Повертає None, якщо реліз саме збирає інший процес або основні файли
+    саме переписуються — тоді реліз збереться на наступній перевірці.
+    """
+    paths = source_paths(paths)
+    with build_lock(root) as acquired:
+        if not acquired:
+            return None
+        previous = current_release(root)
+        built_from = release_source(previous, root) if previous else None
+        state = source_state(paths)
+        if csv_replaced(built_from, state):
+            convert_csv(paths, state['data_version'])
+
+        with write_lock(paths['data'], wait=False) as writable:
+            if not writable:
+                return None
+            state = source_state(paths)
+            origin = state_version(state)
+            if built_from is not None and built_from['source_version'] == origin:
+                # Реліз для цього джерела вже зібрав інший процес
+                return previous
+
+            tmp_dir = os.path.join(root, f'.tmp-{uuid.uuid4().hex}')
+            os.makedirs(tmp_dir)
+            try:
+                version = _stage(tmp_dir, paths)
+                with open(os.path.join(tmp_dir, SOURCE_FILE), 'w', encoding='utf-8') as f:
+                    json.dump({'source_version': origin, **state, 'built_at': time.time()}, f)
+                target = release_dir(version, root)
+                if os.path.isdir(target):
+                    # Такий самий реліз уже є (версія — хеш вмісту): оновлюємо
+                    # лише запис про джерело, щоб не збирати його знову
+                    os.replace(os.path.join(tmp_dir, SOURCE_FILE), os.path.join(target, SOURCE_FILE))
+                else:
+                    os.rename(tmp_dir, target)
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        _set_current(version, root)
+        prune(root, keep=version)
+    return version
+
+
+def prune(root=RELEASES_DIR, keep=None):
+    """Видаляє старі релізи, лишаючи `KEEP_RELEASES` найновіших і `keep`."""
+    releases = sorted(
+        (entry for entry in os.scandir(root) if entry.is_dir() and not entry.name.startswith('.')),
+        key=lambda entry: entry.stat().st_mtime, reverse=True
+    )
+    for entry in releases[KEEP_RELEASES:]:
+        if entry.name != keep:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+class Refresher:
+    """Фоновий потік, що знімає новий реліз, коли змінюються основні артефакти."""
+
+    def __init__(self, paths=None, root=RELEASES_DIR, interval=REFRESH_INTERVAL, publish=False):
+        self.paths = paths
+        self.root = root
+        self.interval = interval
+        self.publish = publish
+        self.building = False
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='data-refresher', daemon=True)
+        # Без релізів перший реліз знімається на першій перевірці; його версія
+        # збігається з версією основних файлів, тож кеші лишаються чинними
+        current = current_release(root)
+        self._built_from = release_source(current, root)['source_version'] if current else None
+
+    def start(self):
+        if self.interval > 0:
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def check(self):
+        """Знімає реліз, якщо джерело змінилося; повертає нову версію або None.
+
+        З `publish=True` поточний реліз ще й публікується у спільне сховище,
+        якщо його там немає, тож запит сторінки не чекає на конвертацію.
+        """
+        # None — джерело не змінилося, реліз збирає інший процес або файли
+        # саме переписуються
+        version = None
+        try:
+            origin = state_version(source_state(source_paths(self.paths)))
+            if origin != self._built_from:
+                self.building = True
+                version = build_release(self.paths, self.root)
+                if version is not None:
+                    self._built_from = release_source(version, self.root)['source_version']
+            if self.publish:
+                self._publish()
+        except Exception as error:
+            # Поточний реліз лишається чинним; спробуємо знову на наступній перевірці
+            self.last_error = f'{type(error).__name__}: {error}'
+            return None
+        finally:
+            self.building = False
+        self.last_error = None
+        return version
+
+    def _publish(self):
+        current = current_release(self.root)
+        if current is not None and not is_published(current):
+            publish_release(current)
+
+    def _run(self):
+        # Перша перевірка — одразу після старту, щоб не чекати інтервал на публікацію
+        while True:
+            self.check()
+            if self._stop.wait(self.interval):
+                break
+
+
+if __name__ == '__main__':
+    version = build_release()
+    print(f"Поточна версія даних: '{version}'" if version else 'Реліз саме збирає інший процес')
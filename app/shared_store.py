@@ -0,0 +1,146 @@
+"""Спільне сховище тільки для читання для багатокористувацького режиму.
+
+Оброблений датасет і суми по групах один раз на версію перекладаються з
+Parquet у файли Arrow IPC без стиснення (pyarrow, без проміжного
+DataFrame). Публікує фоновий потік дашборду після збірки релізу (див.
+`refresh.Refresher`), тож запит сторінки ніколи не чекає на конвертацію;
+поки версію не опубліковано, дашборд читає Parquet. Разова публікація
+поточної версії (наприклад, з вимкненим фоновим оновленням):
+
+    python app/shared_store.py
+
+Кожен процес відкриває файли через `memory_map`, тож дані фізично лежать
+у сторінковому кеші ОС в одному екземплярі, а колонки DataFrame
+посилаються на ці сторінки без копіювання. Усередині процесу дашборд
+роздає всім сесіям один і той самий об'єкт (`st.cache_resource`).
+
+Файли вважаються незмінними: DataFrame з `open_dataset` не можна змінювати.
+"""
+import os
+import shutil
+import uuid
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from aggregates import GROUP_SPECS, SUMS_DIR, sums_files
+from storage import APPEND_DIR, PARQUET_PATH, dataset_files
+
+
+SERVING_DIR = 'data/processed/serving'
+# Скільки останніх версій залишати на диску
+KEEP_VERSIONS = 2
+
+
+def version_dir(version, root=SERVING_DIR):
+    return os.path.join(root, version)
+
+
+def _write_table(table, path):
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _read_table(path):
+    return pa.ipc.open_file(pa.memory_map(path)).read_all()
+
+
+def _read_dataset(path, append_dir):
+    """Основний файл і частини однією таблицею Arrow.
+
+    Числові типи частин вирівнюються до ширшого, а словники категорій
+    об'єднуються в один (файл IPC не допускає різних словників колонки).
+    Кожен файл зберігає повний перелік рівнів залежності (див.
+    `storage.optimize_dtypes`), тож їхній порядок не змінюється.
+    """
+    tables = [pq.read_table(f) for f in dataset_files(path, append_dir)]
+    table = pa.concat_tables(tables, promote_options='permissive').unify_dictionaries()
+    # Одна частина на колонку — інакше to_pandas склеює їх копіюванням;
+    # метадані pandas описують типи першого файлу, а не об'єднаної таблиці
+    return table.combine_chunks().replace_schema_metadata(None)
+
+
+def is_published(version, root=SERVING_DIR):
+    return os.path.isdir(version_dir(version, root))
+
+
+def publish(version, path=PARQUET_PATH, append_dir=APPEND_DIR, sums_dir=SUMS_DIR, root=SERVING_DIR):
+    """Записує версію датасету у спільне сховище, якщо її там ще немає.
+
+    Файли пишуться у тимчасову теку, яка потім атомарно перейменовується,
+    тож паралельні процеси бачать або повну версію, або жодної.
+    """
+    target = version_dir(version, root)
+    if os.path.isdir(target):
+        return target
+    tmp_dir = os.path.join(root, f'.tmp-{uuid.uuid4().hex}')
+    os.makedirs(os.path.join(tmp_dir, 'sums'))
+    try:
+        _write_table(_read_dataset(path, append_dir), os.path.join(tmp_dir, 'dataset.arrow'))
+        for sums_path in sums_files(sums_dir):
+            name = os.path.splitext(os.path.basename(sums_path))[0]
+            _write_table(pq.read_table(sums_path).replace_schema_metadata(None),
+                         os.path.join(tmp_dir, 'sums', f'{name}.arrow'))
+        os.rename(tmp_dir, target)
+    except OSError:
+        # Інший процес уже опублікував цю версію
+        if not os.path.isdir(target):
+            raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    prune(root, keep=version)
+    return target
+
+
+def prune(root=SERVING_DIR, keep=None):
+    """Видаляє старі версії (вже відкриті mmap у Linux лишаються чинними)."""
+    versions = sorted(
+        (entry for entry in os.scandir(root) if entry.is_dir() and not entry.name.startswith('.')),
+        key=lambda entry: entry.stat().st_mtime, reverse=True
+    )
+    for entry in versions[KEEP_VERSIONS:]:
+        if entry.name != keep:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def open_dataset(version, columns=None, root=SERVING_DIR):
+    """DataFrame, колонки якого відображені з файлу Arrow без копіювання."""
+    table = _read_table(os.path.join(version_dir(version, root), 'dataset.arrow'))
+    if columns:
+        table = table.select(list(columns))
+    # split_blocks: кожна числова колонка — окремий блок поверх буфера Arrow
+    return table.to_pandas(split_blocks=True)
+
+
+def open_sums(version, root=SERVING_DIR):
+    sums = {}
+    for name, (keys, _) in GROUP_SPECS.items():
+        table = _read_table(os.path.join(version_dir(version, root), 'sums', f'{name}.arrow')).to_pandas()
+        table[keys] = table[keys].astype(object)
+        sums[name] = table.set_index(keys)
+    return sums
+
+
+def publish_release(version, root=SERVING_DIR):
+    """Публікує версію з артефактів релізу `version` (або основних файлів)."""
+    from refresh import APPEND_SUBDIR, DATA_FILE, SUMS_SUBDIR, artifact_path
+
+    return publish(version, path=artifact_path(version, DATA_FILE, PARQUET_PATH),
+                   append_dir=artifact_path(version, APPEND_SUBDIR, APPEND_DIR),
+                   sums_dir=artifact_path(version, SUMS_SUBDIR, SUMS_DIR), root=root)
+
+
+def main():
+    from aggregates import dataset_version
+    from refresh import REFRESH_INTERVAL, current_release
+
+    # Та сама версія, яку обере дашборд (див. loaders.resolve_version)
+    release = current_release() if REFRESH_INTERVAL > 0 else None
+    version = release or dataset_version(*dataset_files(), *sums_files())
+    publish_release(version)
+    print(f"Версію '{version}' опубліковано у '{version_dir(version)}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+"""Колонкове сховище обробленого датасету.
+
+Очищені дані зберігаються у Parquet з категоріальними типами та
+зменшеними числовими типами. Кожна сторінка читає лише потрібні колонки.
+
+Усі, хто переписує оброблені артефакти (`pipeline.py`, `incremental.py`,
+`clustering.py --k`, цей модуль), роблять це під `write_lock`, а збірка
+релізу (`refresh.py`) під ним же знімає копію, тож реліз ніколи не
+поєднує файли двох різних запусків. Конвертація наявного CSV у Parquet:
+
+    python app/storage.py
+"""
+import fcntl
+import glob
+import os
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+
+PARQUET_PATH = 'data/processed/cleaned_data.parquet'
+CSV_PATH = 'data/processed/cleaned_data.csv'
+# Нові респонденти, дописані після повної збірки (див. incremental.py)
+APPEND_DIR = 'data/processed/appended'
+# Файл блокування запису поруч із датасетом (див. `write_lock`)
+WRITE_LOCK_FILE = '.write.lock'
+
+# Рядкові колонки з невеликою кількістю унікальних значень
+CATEGORICAL_COLUMNS = [
+    'Gender', 'Academic_Level', 'Country', 'Most_Used_Platform',
+    'Affects_Academic_Performance', 'Relationship_Status', 'Region', 'Platform_Type'
+]
+ADDICTION_LEVELS = ['Low', 'Medium', 'High']
+
+# Які колонки потрібні сторінкам, що читають рядки датасету. Сторінок
+# без рядків (географія — з агрегатів, ML — з моделі) тут навмисно немає:
+# порожній список для load_view означав би «усі колонки».
+PAGE_COLUMNS = {
+    'Головна': ['Avg_Daily_Usage_Hours', 'Addicted_Score', 'Region'],
+    'Аналіз гіпотез': [
+        'Avg_Daily_Usage_Hours', 'Sleep_Hours_Per_Night', 'Mental_Health_Score',
+        'Addicted_Score', 'Addiction_Level', 'Relationship_Status',
+        'Affects_Academic_Performance_Numeric'
+    ],
+}
+
+# Колонки, з яких будуються агрегати (див. aggregates.build_aggregates)
+AGGREGATE_COLUMNS = [
+    'Student_ID', 'Most_Used_Platform', 'Platform_Type', 'Gender', 'Addicted_Score',
+    'Avg_Daily_Usage_Hours', 'Relationship_Status', 'Conflicts_Over_Social_Media',
+    'Country', 'Region'
+]
+
+
+def optimize_dtypes(df):
+    """Перетворює рядки на категорії, а числа — на найменший достатній тип."""
+    df = df.copy()
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    if 'Addiction_Level' in df.columns:
+        df['Addiction_Level'] = pd.Categorical(df['Addiction_Level'], categories=ADDICTION_LEVELS, ordered=True)
+
+    for col in df.select_dtypes(include='integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    for col in df.select_dtypes(include='float').columns:
+        df[col] = pd.to_numeric(df[col], downcast='float')
+    return df
+
+
+def write_dataset(df, path=PARQUET_PATH):
+    """Зберігає датасет у Parquet (атомарно, через тимчасовий файл)."""
+    tmp_path = f'{path}.tmp'
+    optimize_dtypes(df).to_parquet(tmp_path, index=False, compression='zstd')
+    os.replace(tmp_path, path)
+
+
+def dataset_files(path=PARQUET_PATH, append_dir=APPEND_DIR):
+    """Основний файл датасету та дописані до нього частини (у порядку запису).
+
+    `append_dir=None` — лише сам файл (наприклад, проміжний файл збірки).
+    """
+    if append_dir is None:
+        return [path]
+    return [path] + sorted(glob.glob(os.path.join(append_dir, 'part-*.parquet')))
+
+
+def append_part(df, append_dir=APPEND_DIR):
+    """Записує нові рядки окремою частиною, не переписуючи основний файл."""
+    os.makedirs(append_dir, exist_ok=True)
+    part_path = os.path.join(append_dir, f'part-{len(dataset_files(append_dir=append_dir)):05d}.parquet')
+    write_dataset(df, part_path)
+    return part_path
+
+
+def clear_appended(append_dir=APPEND_DIR):
+    """Видаляє дописані частини (після повної перезбірки основного файлу)."""
+    for part in dataset_files(append_dir=append_dir)[1:]:
+        os.remove(part)
+
+
+def read_dataset(path=PARQUET_PATH, columns=None, append_dir=APPEND_DIR):
+    """Читає датасет, за потреби лише вказані колонки.
+
+    Parquet зберігає типи, тому категорії та зменшені числа відновлюються
+    без додаткових перетворень. Якщо є дописані частини, вони читаються
+    разом з основним файлом. CSV підтримується як запасний варіант.
+    """
+    if path.endswith('.csv'):
+        return optimize_dtypes(pd.read_csv(path, usecols=columns))
+    files = dataset_files(path, append_dir)
+    if len(files) == 1:
+        return pd.read_parquet(path, columns=columns)
+    # Категорії в різних частинах відрізняються, тому типи вирівнюємо після об'єднання
+    frames = [pd.read_parquet(f, columns=columns) for f in files]
+    return optimize_dtypes(pd.concat(frames, ignore_index=True))
+
+
+def sample_dataset(path=PARQUET_PATH, columns=None, rows=100_000, append_dir=APPEND_DIR,
+                   seed=42, batch_size=100_000):
+    """Рівномірна вибірка до `rows` рядків без читання всього датасету.
+
+    Файли читаються пакетами; кожен рядок отримує випадковий ключ, і
+    зберігаються `rows` рядків з найменшими ключами, тож у пам'яті
+    одночасно не більше `rows` рядків і одного пакета.
+    """
+    rng = np.random.default_rng(seed)
+    kept, keys = None, np.empty(0)
+    for f in dataset_files(path, append_dir):
+        for batch in pq.ParquetFile(f).iter_batches(batch_size=batch_size, columns=columns):
+            chunk = batch.to_pandas()
+            kept = chunk if kept is None else pd.concat([kept, chunk], ignore_index=True)
+            keys = np.concatenate([keys, rng.random(len(chunk))])
+            if len(kept) > rows:
+                keep = np.argpartition(keys, rows)[:rows]
+                kept, keys = kept.iloc[keep].reset_index(drop=True), keys[keep]
+    return optimize_dtypes(kept)
+
+
+@contextmanager
+def file_lock(path, wait=True):
+    """Блокування між процесами на файлі `path`; дає True, якщо його взято.
+
+    З `wait=False` одразу дає False, якщо блокування тримає інший процес.
+    Блокування знімає ОС, коли процес завершується, тож після збою воно
+    не лишається висіти.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    fd = os.open(path, os.O_CREAT | os.O_RDWR)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            acquired = True
+        except BlockingIOError:
+            acquired = False
+        yield acquired
+    finally:
+        os.close(fd)
+
+
+def write_lock(path=PARQUET_PATH, wait=True):
+    """Блокування запису оброблених артефактів датасету `path`."""
+    return file_lock(os.path.join(os.path.dirname(path) or '.', WRITE_LOCK_FILE), wait)
+
+
+def read_preview(path=PARQUET_PATH, n=10):
+    """Перші `n` рядків без читання всього файлу."""
+    batch = next(pq.ParquetFile(path).iter_batches(batch_size=n))
+    return batch.to_pandas()
+
+
+def main(argv=None):
+    import argparse
+
+    from aggregates import SUMS_DIR, dataset_version, save_sums, sums_files
+    from streaming import DEFAULT_CHUNKSIZE, convert_csv
+    from summary import SUMMARY_PATH, save_summary, summarize_parquet
+
+    parser = argparse.ArgumentParser(description='Конвертація обробленого CSV у Parquet.')
+    parser.add_argument('--csv', default=CSV_PATH, help='оброблений CSV (з колонкою Cluster)')
+    parser.add_argument('--out', default=PARQUET_PATH, help='куди записати Parquet')
+    parser.add_argument('--append-dir', default=APPEND_DIR, help='дописані частини, які замінює конвертація')
+    parser.add_argument('--sums-dir', default=SUMS_DIR, help='куди записати суми по групах')
+    parser.add_argument('--summary', default=SUMMARY_PATH, help='куди записати знімок для «Головної»')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='рядків у частині')
+    parser.add_argument('--expect-version', help='конвертувати, лише якщо Parquet досі має цю версію')
+    args = parser.parse_args(argv)
+
+    # Файл читається частинами, тож пам'ять не залежить від його розміру
+    with write_lock(args.out):
+        if args.expect_version and os.path.exists(args.out) and dataset_version(args.out) != args.expect_version:
+            # Поки чекали блокування, Parquet переписав інший процес
+            print(f"Файл '{args.out}' змінився, конвертацію пропущено")
+            return
+        sums = convert_csv(args.csv, args.out, args.chunksize)
+        # Суми й файл будуються лише з CSV, тож дописані частини більше не потрібні
+        clear_appended(args.append_dir)
+        save_sums(sums, args.sums_dir)
+        version = dataset_version(*dataset_files(args.out, args.append_dir), *sums_files(args.sums_dir))
+        save_summary(summarize_parquet(args.out), version, args.summary)
+    print(f"Файл '{args.out}' успішно створено!")
+
+
+if __name__ == '__main__':
+    main()
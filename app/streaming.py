@@ -0,0 +1,172 @@
+"""Потокове очищення для експортів, що не вміщаються в пам'ять.
+
+Сирий CSV читається частинами по `chunksize` рядків. Кожна частина
+проходить ті самі перетворення, що й у `pipeline.transform`, після чого
+її суми по групах додаються до накопичених. У пам'яті одночасно є лише
+одна частина та невеликі таблиці сум, тож пікове споживання не залежить
+від розміру файлу:
+
+    python app/pipeline.py --chunksize 100000
+
+Повна збірка (`stream_build`) робить три проходи: очищення у проміжний
+Parquet, навчання MiniBatchKMeans частинами (див. `clustering.py`) і
+розмітка кластерів з записом остаточного Parquet та копії CSV. Кожен файл
+пишеться поруч і атомарно замінює попередній, тож дашборд ніколи не
+читає напівзаписаний датасет.
+"""
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from aggregates import aggregates_from_sums, group_sums, merge_sums
+from model import N_CLUSTERS, predict_clusters
+from pipeline import OUTPUT_COLUMNS, transform
+from storage import CATEGORICAL_COLUMNS, optimize_dtypes
+
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Фіксовані типи колонок: `optimize_dtypes` зменшує числа за діапазоном
+# конкретної частини, тож без спільної схеми частини мали б різні типи.
+# Ті самі типи, що й у файлі `storage.write_dataset`, але з запасом:
+# у великих експортах Student_ID не вміщується в int16.
+NUMERIC_TYPES = {
+    'Student_ID': pa.int32(),
+    'Age': pa.int8(),
+    'Avg_Daily_Usage_Hours': pa.float32(),
+    'Sleep_Hours_Per_Night': pa.float32(),
+    'Mental_Health_Score': pa.int8(),
+    'Conflicts_Over_Social_Media': pa.int8(),
+    'Addicted_Score': pa.int8(),
+    'Affects_Academic_Performance_Numeric': pa.int8(),
+    'Cluster': pa.int8(),
+}
+
+
+def _column_type(col):
+    if col == 'Addiction_Level':
+        return pa.dictionary(pa.int8(), pa.string(), ordered=True)
+    if col in CATEGORICAL_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    return NUMERIC_TYPES[col]
+
+
+STREAM_SCHEMA = pa.schema([(col, _column_type(col)) for col in OUTPUT_COLUMNS])
+
+
+def chunk_table(chunk):
+    """Частина датасету як таблиця Arrow зі схемою `STREAM_SCHEMA`."""
+    schema = pa.schema([STREAM_SCHEMA.field(col) for col in chunk.columns])
+    table = pa.Table.from_pandas(optimize_dtypes(chunk), preserve_index=False)
+    return table.cast(schema)
+
+
+def iter_clean_chunks(raw_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Очищені частини сирого файлу (без колонки `Cluster`)."""
+    columns = [col for col in OUTPUT_COLUMNS if col != 'Cluster']
+    for chunk in pd.read_csv(raw_path, chunksize=chunksize):
+        yield transform(chunk)[columns]
+
+
+def write_chunks(chunks, out_path):
+    """Записує частини у Parquet по одній row group на частину (атомарно).
+
+    Повертає частини далі, тож запис можна поєднати з іншою обробкою.
+    """
+    tmp_path = f'{out_path}.tmp'
+    writer = None
+    try:
+        for chunk in chunks:
+            table = chunk_table(chunk)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema, compression='zstd')
+            writer.write_table(table)
+            yield chunk
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            writer = None
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if writer is not None:
+        writer.close()
+        os.replace(tmp_path, out_path)
+
+
+def stream_sums(raw_path, chunksize=DEFAULT_CHUNKSIZE, out_path=None):
+    """Один прохід по файлу: накопичені суми по групах.
+
+    Якщо вказано `out_path`, очищені рядки паралельно записуються у Parquet
+    (без колонки `Cluster`, див. `stream_build`).
+    """
+    chunks = iter_clean_chunks(raw_path, chunksize)
+    if out_path:
+        chunks = write_chunks(chunks, out_path)
+    sums = None
+    for chunk in chunks:
+        sums = merge_sums(sums, group_sums(chunk))
+    return sums
+
+
+def label_clusters(src_path, out_path, model, csv_path=None, batch_size=DEFAULT_CHUNKSIZE):
+    """Переписує `src_path` у `out_path`, додаючи кластери від `model`.
+
+    Якщо вказано `csv_path`, так само частинами пишеться копія у CSV.
+    """
+    def labeled():
+        for batch in pq.ParquetFile(src_path).iter_batches(batch_size=batch_size):
+            chunk = batch.to_pandas()
+            chunk['Cluster'] = predict_clusters(model, chunk)
+            yield chunk[OUTPUT_COLUMNS]
+
+    chunks = write_chunks(labeled(), out_path)
+    if not csv_path:
+        for _ in chunks:
+            pass
+        return
+    tmp_path = f'{csv_path}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(f, index=False, header=i == 0)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, csv_path)
+
+
+def stream_build(raw_path, out_path, csv_path=None, chunksize=DEFAULT_CHUNKSIZE, n_clusters=N_CLUSTERS):
+    """Повна потокова збірка: суми по групах, модель і датасет з кластерами.
+
+    Модель — MiniBatchKMeans, навчений частинами, у форматі `model.fit_model`,
+    тож сторінка «ML Діагностика» та дописування нових респондентів
+    працюють з нею так само.
+    """
+    from clustering import fit_minibatch
+
+    unlabeled_path = f'{out_path}.unlabeled'
+    try:
+        sums = stream_sums(raw_path, chunksize, out_path=unlabeled_path)
+        model = fit_minibatch(unlabeled_path, n_clusters, batch_size=chunksize, append_dir=None)
+        label_clusters(unlabeled_path, out_path, model, csv_path, chunksize)
+    finally:
+        if os.path.exists(unlabeled_path):
+            os.remove(unlabeled_path)
+    return sums, model
+
+
+def convert_csv(csv_path, out_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Оброблений CSV (з колонкою `Cluster`) → Parquet частинами; повертає суми по групах."""
+    chunks = write_chunks((chunk[OUTPUT_COLUMNS] for chunk in pd.read_csv(csv_path, chunksize=chunksize)), out_path)
+    sums = None
+    for chunk in chunks:
+        sums = merge_sums(sums, group_sums(chunk))
+    return sums
+
+
+def stream_aggregates(raw_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Ті самі таблиці, що й `aggregates.build_aggregates`, але без завантаження всього файлу."""
+    return aggregates_from_sums(stream_sums(raw_path, chunksize))
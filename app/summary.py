@@ -0,0 +1,100 @@
+"""Знімок підсумкових показників для сторінки «Головна».
+
+Інжест (`pipeline.py`, `incremental.py`) записує невеликий JSON із
+кількістю рядків, сумами для середніх, унікальними значеннями колонок
+фільтрів і першими рядками датасету. Головна сторінка та бічна панель
+фільтрів показуються з нього, не завантажуючи датасет. Знімок дійсний
+лише для версії даних, з якою його записано (див. `aggregates.dataset_version`).
+
+Як і суми по групах, знімки можна об'єднувати: дописана партія додає свої
+суми й значення до наявного знімка.
+"""
+import json
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from filters import INDEX_COLUMNS
+
+
+SUMMARY_PATH = 'data/processed/summary.json'
+PREVIEW_ROWS = 10
+# Колонки, середні яких показує «Головна»
+MEAN_COLUMNS = ['Avg_Daily_Usage_Hours', 'Addicted_Score']
+# Колонки, для яких зберігаються унікальні значення (фільтри та кількість регіонів)
+VALUE_COLUMNS = INDEX_COLUMNS
+
+
+def build_summary(df):
+    """Знімок для датафрейму; колонки, яких у ньому немає, пропускаються."""
+    preview = json.loads(df.head(PREVIEW_ROWS).to_json(orient='split', index=False))
+    return {
+        'rows': len(df),
+        'sums': {col: float(df[col].sum()) for col in MEAN_COLUMNS if col in df},
+        'counts': {col: int(df[col].count()) for col in MEAN_COLUMNS if col in df},
+        'values': {col: sorted(df[col].dropna().unique().tolist()) for col in VALUE_COLUMNS if col in df},
+        'preview': {'columns': preview['columns'], 'data': preview['data']},
+    }
+
+
+def merge_summaries(left, right):
+    """Знімок об'єднання двох частин датасету (`right` дописано після `left`)."""
+    if left is None:
+        return right
+    return {
+        'rows': left['rows'] + right['rows'],
+        'sums': {col: left['sums'][col] + right['sums'].get(col, 0.0) for col in left['sums']},
+        'counts': {col: left['counts'][col] + right['counts'].get(col, 0) for col in left['counts']},
+        'values': {
+            col: sorted(set(values) | set(right['values'].get(col, [])))
+            for col, values in left['values'].items()
+        },
+        # Перші рядки датасету не змінюються, доки їх менше за PREVIEW_ROWS
+        'preview': {
+            'columns': left['preview']['columns'],
+            'data': (left['preview']['data'] + right['preview']['data'])[:PREVIEW_ROWS],
+        },
+    }
+
+
+def summarize_parquet(path, batch_size=100_000):
+    """Знімок файлу Parquet, прочитаного частинами (для потокового режиму)."""
+    parquet = pq.ParquetFile(path)
+    columns = [col for col in MEAN_COLUMNS + VALUE_COLUMNS if col in parquet.schema_arrow.names]
+    summary = None
+    for batch in parquet.iter_batches(batch_size=batch_size, columns=columns):
+        summary = merge_summaries(summary, build_summary(batch.to_pandas()))
+    # Попередній перегляд — з усіма колонками
+    first = next(parquet.iter_batches(batch_size=PREVIEW_ROWS))
+    summary['preview'] = build_summary(first.to_pandas())['preview']
+    return summary
+
+
+def summary_metrics(summary):
+    """Показники «Головної»: кількість рядків, середні та кількість унікальних значень."""
+    return {
+        'rows': summary['rows'],
+        'means': {col: summary['sums'][col] / summary['counts'][col] for col in summary['sums']},
+        'distinct': {col: len(values) for col, values in summary['values'].items()},
+    }
+
+
+def preview_frame(summary):
+    return pd.DataFrame(summary['preview']['data'], columns=summary['preview']['columns'])
+
+
+def save_summary(summary, version, path=SUMMARY_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': version, **summary}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def load_summary(path=SUMMARY_PATH):
+    """Збережений знімок (з ключем 'version') або None, якщо його немає."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,15 @@
+"""Сторінки дашборду.
+
+Кожна сторінка — окремий модуль з функцією `render(version, filters)`.
+Головний скрипт імпортує модуль лише тоді, коли сторінку відкрито, тож
+важкі залежності (scipy, plotly, folium, scikit-learn) не завантажуються
+під час холодного старту.
+"""
+
+# Назва сторінки в навігації → модуль
+PAGES = {
+    "Головна": "views.home",
+    "Аналіз гіпотез": "views.analysis",
+    "Глобальна географія": "views.geography",
+    "ML Діагностика": "views.diagnostics",
+}
@@ -0,0 +1,160 @@
+"""Сторінка «Аналіз гіпотез»: графіки та статистичні вердикти гіпотез 1–6."""
+import streamlit as st
+
+from charts import MAX_POINTS, RENDER_MODES, box_stats, ols_lines, resolve_mode, stratified_sample
+from figures import (
+    academic_box, conflicts_bar, gender_bar, mental_health_box, platform_bar,
+    platform_treemap, relationship_box, sleep_scatter, type_scatter
+)
+from instrumentation import current as current_metrics, tracked
+from loaders import cached_figure, load_aggregates, load_page, load_view
+from storage import PAGE_COLUMNS
+from views.verdicts import load_hypotheses, show_verdict
+
+
+# Дані для графіків гіпотез: лінія OLS і квартилі рахуються один раз на
+# версію датасету, у браузер іде лише вибірка або агрегати.
+HYPOTHESIS_COLUMNS = tuple(PAGE_COLUMNS['Аналіз гіпотез'])
+
+@tracked(st.cache_data(max_entries=32))
+def load_trendlines(version, filters):
+    df = load_view(version, HYPOTHESIS_COLUMNS, filters)
+    return ols_lines(df, 'Avg_Daily_Usage_Hours', 'Sleep_Hours_Per_Night', 'Addiction_Level')
+
+@tracked(st.cache_data(max_entries=32))
+def load_box_stats(version, filters, x, y):
+    return box_stats(load_view(version, HYPOTHESIS_COLUMNS, filters), x, y)
+
+@tracked(st.cache_data(max_entries=32))
+def load_sample(version, filters, by, n):
+    return stratified_sample(load_view(version, HYPOTHESIS_COLUMNS, filters), by, n)
+
+
+def render(version, filters):
+    metrics = current_metrics()
+    with metrics.section('aggregates'):
+        aggs = load_aggregates(version, filters)
+    df = load_page(version, "Аналіз гіпотез", filters)
+
+    st.title("🧬 Глибокий аналіз гіпотез")
+    st.write("У цьому розділі ми перевіряємо статистичні припущення про вплив соцмереж на життя студентів.")
+    with metrics.section('tests', rows=len(df)):
+        hypothesis_results = load_hypotheses(version, filters, range(1, 7))
+
+    # Створюємо закладки для різних груп гіпотез
+    tab1, tab2, tab3 = st.tabs(["🏥 Здоров'я та Психіка", "📱 Платформи", "🤝 Соціальні зв'язки"])
+    # Режим відображення: для великих датасетів — вибірка або агрегати
+    with st.sidebar.expander("Відображення графіків"):
+        render_mode = st.selectbox("Режим", list(RENDER_MODES), format_func=RENDER_MODES.get)
+        max_points = st.number_input("Макс. точок на графік", min_value=100, value=MAX_POINTS, step=500)
+    scatter_mode = resolve_mode(render_mode, len(df), max_points)
+    # Box-графіки мають лише два режими: усі точки або квартилі
+    box_mode = 'exact' if scatter_mode == 'exact' else 'quantiles'
+
+    with tab1, metrics.section('tab1'):
+        st.header("Вплив на фізичний та ментальний стан")
+        
+        st.subheader("Гіпотеза 1: Соцмережі та якість сну")
+        points = load_sample(version, filters, "Addiction_Level", max_points) if scatter_mode == 'sample' else df
+        fig1 = cached_figure(('fig1', version, filters), lambda: sleep_scatter(
+            points, load_trendlines(version, filters), density=scatter_mode == 'density'
+        ), scatter_mode, max_points)
+        st.plotly_chart(fig1, width='stretch')
+        show_verdict(hypothesis_results, 1, "**Висновок:** Чітка негативна кореляція. Зростання часу у соцмережах безпосередньо веде до скорочення тривалості сну.")
+
+        st.write("---")
+
+        st.subheader("Гіпотеза 2: Залежність та ментальний стан")
+        fig2 = cached_figure(('fig2', version, filters), lambda: mental_health_box(df) if box_mode == 'exact' else mental_health_box(
+            stats=load_box_stats(version, filters, "Addiction_Level", "Mental_Health_Score")
+        ), box_mode)
+        st.plotly_chart(fig2, width='stretch')
+        show_verdict(hypothesis_results, 2, "**Висновок:** Студенти з високим рівнем залежності мають значно нижчі медіанні показники ментального здоров'я.")
+
+    with tab2, metrics.section('tab2'):
+        st.header("Аналіз за платформами")
+        st.subheader("Гіпотеза 3: Платформи з алгоритмічною стрічкою vs Інші")
+        
+        platform_stats = aggs['platform_stats']
+        
+        fig3 = cached_figure(('fig3', version, filters), lambda: platform_bar(platform_stats))
+        st.plotly_chart(fig3, width='stretch')
+        show_verdict(hypothesis_results, 3, "**Аналітичний інсайт:** Платформи, що використовують алгоритми 'нескінченної стрічки' (TikTok, Instagram), мають найвищий статистичний зв'язок із балом залежності.")
+        st.write("---")
+        
+        st.header("Аналіз за типами контенту")
+        st.write("Ми згрупували платформи за їхньою основною функцією, щоб знайти 'дофамінові пастки'.")
+
+
+
+        # 1. Скаттер-плот: Час в мережі vs Залежність
+        st.subheader("⚡️ Співвідношення часу в мережі та адиктивності")
+        
+        type_stats = aggs['type_stats']
+
+        fig_scatter = cached_figure(('fig_scatter', version, filters), lambda: type_scatter(type_stats))
+
+        st.plotly_chart(fig_scatter, use_container_width=True)
+        st.info("**Інсайт:** Категорія 'Entertain-Scroll' (TikTok/Instagram) має найвищу залежність, хоча в месенджерах проводять більше часу. Це доводить агресивність алгоритмів.")
+
+        st.write("---")
+        
+        
+        # 2. Гендерний розподіл за категоріями
+        st.subheader("🚻 Хто і що обирає: Гендерний аспект")
+        
+        gender_data = aggs['gender_data']
+        
+        fig_gender = cached_figure(('fig_gender', version, filters), lambda: gender_bar(gender_data))
+        st.plotly_chart(fig_gender, use_container_width=True)
+        st.warning("**Гендерний розрив:** Хлопці значно більше схильні до використання 'Social-Network' (новинних стрічок), тоді як дівчата домінують у розважальному контенті.\n\n"
+                   "👉 Це вказує на різницю в цілях: хлопці йдуть за інформацією, дівчата — за візуальним контентом."
+        )
+        st.write("---")
+        
+        # 3. Ієрархічна структура: Категорії та Платформи
+        st.subheader("🔍 Структура цифрового споживання")
+        
+        # Готуємо дані для Treemap
+        tree_data = aggs['tree_data']
+
+        fig_tree = cached_figure(('fig_tree', version, filters), lambda: platform_treemap(tree_data))
+
+        st.plotly_chart(fig_tree, use_container_width=True)
+        st.info("Цей графік показує 'вагу' кожної платформи. Розмір прямокутника — це кількість студентів, а колір — наскільки ця платформа 'затягує'.")
+
+
+
+    
+    
+
+    with tab3, metrics.section('tab3'):
+        st.header("Соціальні зв'язки та навчання")
+        
+        # --- Гіпотеза 4 ---
+        st.subheader("Гіпотеза 4: Конфлікти та статус стосунків")
+        conflict_stats = aggs['conflict_stats']
+        
+        fig4 = cached_figure(('fig4', version, filters), lambda: conflicts_bar(conflict_stats))
+        st.plotly_chart(fig4, width='stretch')
+        show_verdict(hypothesis_results, 4, "**Вердикт:** Гіпотеза підтверджена. Статус 'Complicated' демонструє найвищий рівень конфліктів через соціальні медіа.")
+        
+        st.write("---")
+
+        # --- Гіпотеза 5 ---
+        st.subheader("Гіпотеза 5: Стосунки як захисний фактор")
+        fig6 = cached_figure(('fig6', version, filters), lambda: relationship_box(df) if box_mode == 'exact' else relationship_box(
+            stats=load_box_stats(version, filters, "Relationship_Status", "Addicted_Score")
+        ), box_mode)
+        st.plotly_chart(fig6, width='stretch')
+        show_verdict(hypothesis_results, 5, "**Висновок:** Стабільні стосунки ('In a relationship') часто виступають стримуючим фактором, знижуючи середній рівень цифрової залежності.")
+
+        st.write("---")
+        
+        # --- Гіпотеза 6 ---
+        st.subheader("Гіпотеза 6: Вплив залежності на успішність")
+        fig5 = cached_figure(('fig5', version, filters), lambda: academic_box(df) if box_mode == 'exact' else academic_box(
+            stats=load_box_stats(version, filters, "Addiction_Level", "Affects_Academic_Performance_Numeric")
+        ), box_mode)
+        st.plotly_chart(fig5, width='stretch')
+        show_verdict(hypothesis_results, 6, "**Вердикт:** Гіпотеза підтверджена — висока цифрова залежність статистично корелює зі зниженням академічної успішності.")
@@ -0,0 +1,178 @@
+"""Сторінка «ML Діагностика»: цифровий профіль користувача за моделлю K-Means."""
+import os
+import tempfile
+import time
+
+import pandas as pd
+import streamlit as st
+
+from aggregates import dataset_version
+from instrumentation import current as current_metrics, tracked
+from refresh import MODEL_FILE, artifact_path
+
+# Результати пакетної діагностики: окрема тека у тимчасовому каталозі.
+# Файл сесії видаляється, коли завантаження прибрано або замінено; файли
+# сесій, що завершилися, — під час наступних розрахунків, коли їх не
+# використовували довше за RESULTS_TTL секунд.
+RESULTS_DIR = os.path.join(tempfile.gettempdir(), 'dashboard-profiles')
+RESULTS_TTL = 3600
+# Підписи кількостей у пакетній діагностиці
+PROFILE_LABELS = {'Low': '🟢 Збалансовані', 'Medium': '🟡 Група ризику', 'High': '🔴 Високий рівень', 'Error': '⚠️ Помилки в даних'}
+
+# Модель завантажується один раз на процес і спільна для всіх сесій;
+# версія файлу в ключі підхоплює перенавчену модель без перезапуску.
+@tracked(st.cache_resource(max_entries=2))
+def get_model(path, version):
+    from model import load_model
+
+    return load_model(path)
+
+
+def page_model(version):
+    """Модель релізу, з якого показано сторінку, інакше — основна."""
+    from model import MODEL_PATH
+
+    model_path = artifact_path(version, MODEL_FILE, MODEL_PATH)
+    return get_model(model_path, dataset_version(model_path))
+
+
+def sweep_results(max_age=RESULTS_TTL, results_dir=RESULTS_DIR):
+    """Видаляє файли результатів, яких не використовували довше за `max_age`."""
+    if not os.path.isdir(results_dir):
+        return
+    expired = time.time() - max_age
+    for entry in os.scandir(results_dir):
+        try:
+            if entry.stat().st_mtime < expired:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            # Файл уже прибрала інша сесія
+            pass
+
+
+def discard_batch():
+    """Прибирає результати попереднього файлу цієї сесії."""
+    batch = st.session_state.pop('profile_batch', None)
+    if batch is not None and os.path.exists(batch['path']):
+        os.remove(batch['path'])
+
+
+def diagnose_upload(version, upload):
+    """Результати для завантаженого CSV: один розрахунок на файл у сесії.
+
+    Файл обробляється частинами (див. profiles.py), а результати пишуться
+    у тимчасовий файл, тож у пам'яті тримається лише одна частина.
+    """
+    batch = st.session_state.get('profile_batch')
+    if batch is not None and batch['file_id'] == upload.file_id and os.path.exists(batch['path']):
+        # Файл, який ще показується, не вважається застарілим
+        os.utime(batch['path'])
+        return batch
+    discard_batch()
+    sweep_results()
+
+    from profiles import diagnose_csv
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with current_metrics().section('batch') as section:
+        with tempfile.NamedTemporaryFile(suffix='.csv', dir=RESULTS_DIR, delete=False) as target:
+            try:
+                counts = diagnose_csv(upload, target, page_model(version))
+            except Exception:
+                os.remove(target.name)
+                raise
+        section['rows'] = int(counts.sum())
+    batch = {'file_id': upload.file_id, 'name': upload.name, 'path': target.name, 'counts': counts}
+    st.session_state['profile_batch'] = batch
+    return batch
+
+
+# Сторінка працює з моделлю, а не з відфільтрованими даними
+def render(version, filters):
+    metrics = current_metrics()
+    st.title("💻⚙️ Машинне навчання: Цифровий профіль")
+    st.write("""
+    Цей інструмент використовує модель **K-Means**, навчену на даних опитування, щоб визначити, 
+    до якої групи користувачів ви належите, на основі ваших відповідей.
+    """)
+
+    st.subheader("Введіть ваші показники:")
+    
+    with st.container(border=True):
+        col_in1, col_in2 = st.columns(2)
+        
+        with col_in1:
+            usage = st.slider("Скільки годин на день ви проводите в соцмережах?", 0.0, 24.0, 5.0, step=0.25)
+            sleep = st.slider("Скільки годин ви зазвичай спите?", 0.0, 12.0, 8.0, step=0.25)
+        
+        with col_in2:
+            mental = st.select_slider("Оцініть свій ментальний стан (1 - погано, 10 - чудово)", options=list(range(1, 11)), value=8)
+            addicted = st.select_slider("Наскільки ви залежні від соцмереж? (1 - зовсім ні, 10 - дуже)", options=list(range(1, 11)), value=5)
+            performance = st.radio("Чи впливають соцмережі на вашу успішність?", ["Негативно", "Нейтрально/Позитивно"])
+
+    # Кнопка для розрахунку
+    if st.button("Визначити мій профіль", type="primary", width='stretch'):
+        
+        # ПЕРЕВІРКА РЕАЛЬНОСТІ ДАНИХ (Логічний фільтр)
+        if (usage + sleep) > 24.0:
+            st.error(f"⚠️ **Помилка даних:** Сума годин у мережі ({usage}) та сну ({sleep}) складає {usage + sleep} год. В добі всього 24 години. Будь ласка, скоригуйте введені дані.")
+        else:
+            # РОЗРАХУНОК (тільки якщо дані пройшли перевірку)
+            # scikit-learn імпортується лише під час першого розрахунку
+            from model import cluster_levels, score
+
+            with metrics.section('score', rows=1):
+                model = page_model(version)
+                result = score(model, {
+                    'Avg_Daily_Usage_Hours': usage,
+                    'Sleep_Hours_Per_Night': sleep,
+                    'Mental_Health_Score': mental,
+                    'Addicted_Score': addicted,
+                }).iloc[0]
+            cluster = int(result['Cluster'])
+            level = cluster_levels(model)[cluster]
+            
+            st.write("---")
+            st.subheader("Результат аналізу:")
+            st.caption(f"Кластер {cluster}, відстань до центру групи: {result['Distance']:.2f}")
+            
+            if level == 'High':
+                st.error("🔴 **Ваш профіль: Високий рівень залежності**")
+                st.warning("Ваші показники збігаються з групою 'High Addiction'. Рекомендуємо переглянути цифрові звички.")
+            elif level == 'Medium':
+                st.warning("🟡 **Ваш профіль: Середній рівень (Група ризику)**")
+                st.info("Ви знаходитесь у зоні 'Medium Addiction'.")
+            else:
+                st.success("🟢 **Ваш профіль: Збалансований користувач**")
+                st.balloons()
+                st.write("Ваші показники відповідають групі 'Low Addiction'.")
+
+    # ПАКЕТНА ДІАГНОСТИКА (CSV з анкетами)
+    st.write("---")
+    st.subheader("Пакетна діагностика")
+    st.write("""
+    Завантажте CSV з анкетами: колонки `usage`, `sleep`, `mental`, `addicted`
+    (або відповідні назви колонок датасету). Інші колонки, наприклад ідентифікатор
+    анкети, перейдуть у результат без змін. Рядки з некоректними даними не оцінюються,
+    а отримують опис помилки в колонці `Error`.
+    """)
+    upload = st.file_uploader("CSV з анкетами", type='csv')
+    if upload is None:
+        discard_batch()
+        return
+    try:
+        batch = diagnose_upload(version, upload)
+    except (ValueError, pd.errors.ParserError, UnicodeDecodeError) as error:
+        st.error(f"⚠️ **Не вдалося обробити файл:** {error}")
+        return
+
+    counts = batch['counts']
+    columns = st.columns(len(counts))
+    for column, (level, count) in zip(columns, counts.items()):
+        column.metric(PROFILE_LABELS.get(level, level), f"{count:,}".replace(',', ' '))
+    with open(batch['path'], 'rb') as f:
+        st.download_button(
+            "Завантажити результати (CSV)", f,
+            file_name=f"profiles_{os.path.splitext(batch['name'])[0]}.csv",
+            mime='text/csv', width='stretch',
+        )
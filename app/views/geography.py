@@ -0,0 +1,103 @@
+"""Сторінка «Глобальна географія»: карти, регіони та гіпотеза 7."""
+import streamlit as st
+
+from figures import concentration_bubbles, country_choropleth, region_bar
+from instrumentation import current as current_metrics, tracked
+from loaders import cached_figure, load_aggregates
+from maps import ASSET_DIR, MAP_OFFLINE, MAP_TILES, OfflineAssetsError, assets_state, leaders_map_html
+from views.verdicts import load_hypotheses, show_verdict
+
+
+# Режим офлайн і стан локальних копій (`python app/maps.py`) входять у ключ,
+# тож завантажені логотипи й Leaflet підхоплюються без перезапуску сервера.
+# HTML з вбудованими ресурсами великий, тому записів небагато.
+@tracked(st.cache_data(max_entries=8))
+def load_leaders_map(top_reg, tiles, offline, assets):
+    return leaders_map_html(top_reg, tiles, asset_dir=ASSET_DIR, offline=offline)
+
+
+def render(version, filters):
+    metrics = current_metrics()
+    with metrics.section('aggregates'):
+        aggs = load_aggregates(version, filters)
+
+    st.title("🌍 Глобальна географія залежності")
+    st.write("Як цифрова залежність розподілена по світу?")
+    with metrics.section('tests'):
+        hypothesis_results = load_hypotheses(version, filters, (7,))
+
+    # 1. Підготовка даних для карти
+    # Рахуємо середній бал для кожної країни
+    country_map_data = aggs['country_map_data']
+
+    # 2. Створення інтерактивної карти світу
+    st.subheader("Світова карта рівня залежності")
+    
+    fig_map = cached_figure(('fig_map', version, filters), lambda: country_choropleth(country_map_data))
+    st.plotly_chart(fig_map, width='stretch')
+
+    st.write("---")
+
+    # 3. Гіпотеза 7: Порівняння макрорегіонів
+    st.subheader("Гіпотеза 7: Регіональні відмінності (Пн. Америка vs Європа)")
+    
+    # Використовуємо колонку Region, яку ми підготували під час очищення даних
+    region_stats = aggs['region_stats']
+    
+    fig_region = cached_figure(('fig_region', version, filters), lambda: region_bar(region_stats))
+    st.plotly_chart(fig_region, width='stretch')
+
+    show_verdict(hypothesis_results, 7, """
+    **Вердикт:** Гіпотеза 7 підтверджена. Регіони з високою концентрацією технологічних хабів 
+    (зокрема Північна Америка) демонструють вищі показники адиктивності порівняно з Європою.
+    """)
+    st.write("---")
+
+
+    
+    st.subheader("🌍 Регіональні лідери платформ")
+    st.write("Яка платформа домінує на кожному континенті?")
+
+    top_reg = aggs['top_reg']
+
+    # Готовий HTML карти кешується за даними та джерелом тайлів; логотипи
+    # і Leaflet вбудовані в нього, тож сторонні сервери не потрібні
+    with metrics.section('leaders_map', rows=len(top_reg)) as section:
+        try:
+            leaders_map = load_leaders_map(top_reg, MAP_TILES, MAP_OFFLINE, assets_state())
+        except OfflineAssetsError as error:
+            st.warning(f"Карта недоступна в офлайн-режимі: {error}.")
+        else:
+            st.iframe(leaders_map, height=550)
+            section['payload_bytes'] = len(leaders_map.encode('utf-8'))
+    st.info("**Географічний розподіл:** Instagram домінує в більшості регіонів, тоді як TikTok та Facebook утримують лідерство в Південній Америці та Африці відповідно.")
+
+    st.write("---")
+    
+
+
+
+
+
+
+
+
+    
+    st.subheader('🗂️ Матриця концентрації')
+    st.write('Де зосереджені користувачі кожної окремої мережі?')
+
+    # 1. Готуємо дані (агрегуємо кількість)
+    bubble_data = aggs['bubble_data']
+
+    # 2. Будуємо категоріальний Bubble Chart
+    fig_bubble = cached_figure(('fig_bubble', version, filters), lambda: concentration_bubbles(bubble_data))
+
+    st.plotly_chart(fig_bubble, use_container_width=True)
+
+    
+    st.info("""
+    **Географічний інсайт:**
+    * **Європейський хаб:** Європа є центром активності для більшості західних платформ.
+    * **Азійська специфіка:** Тільки в Азії ми бачимо активність у WeChat, LINE та KakaoTalk.
+    * **Глобальність Instagram:** Рядок Instagram має найяскравіші кольори майже в усіх стовпчиках.
+    """)
@@ -0,0 +1,46 @@
+"""Сторінка «Головна»: ключові показники та попередній перегляд даних."""
+import streamlit as st
+
+from instrumentation import current as current_metrics
+from loaders import load_page, load_preview, load_snapshot, load_view
+from summary import build_summary, preview_frame, summary_metrics
+
+
+def render(version, filters):
+    metrics = current_metrics()
+    # Без фільтрів — зі знімка інжесту; датасет читається лише з фільтрами
+    # або коли знімка для поточної версії даних немає
+    summary = None if filters else load_snapshot(version)
+    if summary is None:
+        summary = build_summary(load_page(version, "Головна", filters))
+    stats = summary_metrics(summary)
+
+    st.title("📊 Аналіз залежності студентів від соціальних мереж")
+    st.write("""
+    Вітаємо у дослідницькому проєкті, присвяченому аналізу цифрових звичок молоді. 
+    Ми дослідили дані 700+ студентів з усього світу, щоб зрозуміти, як екранний час 
+    впливає на наше реальне життя.
+    """)
+    
+    st.subheader("Ключові показники (Global Metrics)")
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Респондентів", stats['rows'])
+    with col2:
+        st.metric("Середній час в соцмережах", f"{stats['means']['Avg_Daily_Usage_Hours']:.1f} год/добу")
+    with col3:
+        st.metric("Рівень залежності", f"{stats['means']['Addicted_Score']:.1f}/з 10")
+    with col4:
+        st.metric("Регіонів", stats['distinct']['Region'])
+
+    st.write("---")
+    st.subheader("Попередній перегляд даних")
+    with metrics.section('preview') as section:
+        if filters:
+            preview = load_view(version, None, filters).head(10)
+        else:
+            snapshot = load_snapshot(version)
+            preview = preview_frame(snapshot) if snapshot is not None else load_preview(version)
+        st.dataframe(preview, width='stretch')
+        section.update(rows=len(preview), payload_bytes=int(preview.memory_usage(deep=True).sum()))
@@ -0,0 +1,60 @@
+"""Статистичні вердикти гіпотез, спільні для сторінок аналізу та географії."""
+import pandas as pd
+import streamlit as st
+
+from hypotheses import ALPHA, HYPOTHESES_PATH, TEST_COLUMNS, VIEW_RESAMPLES, evaluate, load_results
+from instrumentation import tracked
+from loaders import load_view
+from refresh import HYPOTHESES_FILE, artifact_path
+
+
+# Результати для всього датасету пораховані під час інжесту або збірки релізу
+@tracked(st.cache_data(max_entries=4))
+def load_saved_hypotheses(version):
+    return load_results(version, artifact_path(version, HYPOTHESES_FILE, HYPOTHESES_PATH))
+
+# З фільтрами тести рахуються на запит і лише для гіпотез сторінки, раз на
+# версію даних, набір фільтрів, список гіпотез і кількість перевибірок
+@tracked(st.cache_data(max_entries=32))
+def evaluate_view(version, filters, numbers, n_resamples):
+    df = load_view(version, tuple(TEST_COLUMNS), filters)
+    return evaluate(df, n_resamples=n_resamples, numbers=numbers)
+
+def load_hypotheses(version, filters, numbers):
+    """Результати гіпотез `numbers` для поточної вибірки.
+
+    Без фільтрів — збережені результати. Якщо їх немає (фільтри або щойно
+    дописані дані), сторінка одразу отримує ефект і p-value, а бутстреп-
+    інтервали, що в сотні разів дорожчі, рахуються лише після натискання
+    кнопки — для цієї вибірки до кінця сесії.
+    """
+    if not filters:
+        saved = load_saved_hypotheses(version)
+        if saved is not None:
+            return saved
+    numbers = tuple(numbers)
+    key = (version, filters, numbers)
+    requested = st.session_state.setdefault('hypothesis_ci', set())
+    if key not in requested and st.button(
+        "Порахувати інтервали довіри", help="Бутстреп для поточної вибірки; може тривати кілька секунд."
+    ):
+        requested.add(key)
+    return evaluate_view(version, filters, numbers, VIEW_RESAMPLES if key in requested else 0)
+
+def show_verdict(results, number, conclusion):
+    """Висновок гіпотези, якщо його підтверджує тест, інакше — застереження."""
+    result = results.loc[number]
+    if not result['n']:
+        st.info("Недостатньо даних для перевірки гіпотези з обраними фільтрами.")
+        return
+    p_text = '' if pd.isna(result['p_value']) else f", p = {result['p_value']:.3g}"
+    ci_text = ("ДІ не пораховано" if pd.isna(result['ci_low'])
+               else f"{1 - ALPHA:.0%} ДІ [{result['ci_low']:.2f}; {result['ci_high']:.2f}]")
+    details = (
+        f"{result['test']}: {result['effect_name']} = {result['effect']:.2f}, "
+        f"{ci_text}{p_text}, n = {result['n']}"
+    )
+    if result['confirmed']:
+        st.success(f"{conclusion}\n\n{details}")
+    else:
+        st.warning(f"**Вердикт:** на поточних даних гіпотеза не підтверджується.\n\n{details}")